@@ -0,0 +1,3 @@
+"""
+Scream Game performance benchmarks
+"""
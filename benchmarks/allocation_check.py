@@ -0,0 +1,116 @@
+"""Check that the per-tick gameplay path doesn't allocate.
+
+Steps the headless simulation (what ``Game.update`` runs while playing)
+under ``tracemalloc``, on the first built-in level and on a generated level
+with thousands of platforms, and reports the memory game code still holds
+after thousands of ticks and the largest short-lived peak within one tick.
+Neither may grow with the tick count or the level size. Run with
+
+    python -m benchmarks.allocation_check
+
+tests/test_allocations.py runs the same check under pytest.
+"""
+
+import os
+import sys
+import tracemalloc
+
+from src.headless import init_headless_display
+
+WARMUP_TICKS = 300
+TICKS = 5000
+# Short-lived allocations allowed per tick (interpreter internals such as
+# large ints and range objects, and NumPy temporaries for moving platforms)
+TRANSIENT_BUDGET = 4096
+# Retained bytes allowed over the whole run: values that changed size (a
+# counter, list capacity), far less than one byte per tick
+RETAINED_BUDGET = 1024
+
+# Only allocations made by game code count as retained
+GAME_CODE = [tracemalloc.Filter(True, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                   "src", "*"))]
+
+# Size of the generated level (about a tenth of the platforms move)
+CROWDED_PLATFORMS = 10000
+
+# Walks, jumps and idles without leaving the first level
+ACTION_CYCLE = ["walk"] + ["none"] * 5 + ["jump"] + ["none"] * 11 + ["dash"] + ["none"] * 11
+
+
+def measure_allocations(tick, ticks=TICKS, warmup=WARMUP_TICKS):
+    """Run ``tick(i)`` under tracemalloc; return (retained bytes, peak transient bytes)"""
+    for i in range(warmup):
+        tick(i)
+
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot().filter_traces(GAME_CODE)
+    worst_transient = 0
+    for i in range(ticks):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        tick(i)
+        _, peak = tracemalloc.get_traced_memory()
+        worst_transient = max(worst_transient, peak - before)
+    end = tracemalloc.take_snapshot().filter_traces(GAME_CODE)
+    tracemalloc.stop()
+
+    retained = sum(stat.size_diff for stat in end.compare_to(start, "filename"))
+    return retained, worst_transient
+
+
+def check_level(sim, ticks=TICKS, warmup=WARMUP_TICKS):
+    """[(path, retained bytes, peak transient bytes)] for the per-tick paths of ``sim``"""
+    player = sim.player
+    level = sim.level_manager.get_current_level()
+    colliders = list(level.get_colliders(player.get_collision_bounds()))
+    cycle = len(ACTION_CYCLE)
+    paths = [
+        ("Simulation.step", lambda i: sim.step(ACTION_CYCLE[i % cycle])),
+        ("Player.update", lambda i: player.update(ACTION_CYCLE[i % cycle], colliders)),
+        ("Level.get_colliders", lambda i: level.get_colliders(player.get_collision_bounds())),
+        ("Level.touches_hazard", lambda i: level.touches_hazard(player.rect)),
+        ("Level.update", lambda i: level.update()),
+    ]
+    return [(name, *measure_allocations(tick, ticks, warmup)) for name, tick in paths]
+
+
+def check_levels(ticks=TICKS, warmup=WARMUP_TICKS):
+    """{level name: check_level results} for the built-in and the generated level"""
+    from benchmarks.physics_benchmark import build_level_data
+    from src.level_manager import LevelManager
+    from src.simulation import Simulation
+
+    return {
+        "built-in level 1": check_level(Simulation(), ticks, warmup),
+        f"{CROWDED_PLATFORMS} platforms": check_level(
+            Simulation(LevelManager([build_level_data(CROWDED_PLATFORMS)])), ticks, warmup),
+    }
+
+
+def over_budget(results):
+    """The (level, path, retained, transient) rows of ``check_levels`` results that fail"""
+    return [(level, name, retained, transient)
+            for level, rows in results.items()
+            for name, retained, transient in rows
+            if retained > RETAINED_BUDGET or transient > TRANSIENT_BUDGET]
+
+
+def main():
+    init_headless_display()
+    results = check_levels()
+
+    print(f"{TICKS} ticks per path")
+    for level, rows in results.items():
+        print(f"\n{level}")
+        print(f"{'path':<22} {'retained B':>10} {'peak B within tick':>18}")
+        for name, retained, transient in rows:
+            print(f"{name:<22} {retained:>10} {transient:>18}")
+
+    failed = over_budget(results)
+    if failed:
+        print(f"\nFAIL: more than {RETAINED_BUDGET} B retained or {TRANSIENT_BUDGET} B allocated within a tick")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
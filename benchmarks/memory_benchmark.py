@@ -0,0 +1,61 @@
+"""Measure the memory each platform costs, alone and inside a Level.
+
+Uses tracemalloc to count every byte allocated while building the objects,
+including their pygame Rects. ``__dict__`` platforms (the layout before
+``Platform`` used ``__slots__``) are built alongside for comparison. Run with
+
+    python -m benchmarks.memory_benchmark
+    python -m benchmarks.memory_benchmark --sizes 1000000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+import pygame
+
+from benchmarks.physics_benchmark import build_level_data
+from src.level_manager import PLATFORM_TYPE_COLORS, Level, MovingPlatform, Platform
+
+SIZES = [1000, 10000, 100000]
+
+
+class DictPlatform:
+    """Platform with a per-instance __dict__ and its own color, for comparison"""
+
+    def __init__(self, x, y, width, height, platform_type="normal"):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.type = platform_type
+        self.color = PLATFORM_TYPE_COLORS.get(platform_type, PLATFORM_TYPE_COLORS["normal"])
+
+
+def bytes_per_item(build, count):
+    """Bytes allocated by ``build()`` and still held, divided by ``count``"""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-platform memory footprint")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="platform counts to test")
+    args = parser.parse_args()
+
+    print(f"{'platforms':>9} {'Platform':>10} {'MovingPlatform':>15} {'__dict__ platform':>18} {'Level':>10}   (bytes each)")
+    for count in args.sizes:
+        # The list holding the objects is counted too; it adds 8 bytes per item
+        slotted = bytes_per_item(lambda: [Platform(i, 0, 50, 20) for i in range(count)], count)
+        moving = bytes_per_item(lambda: [MovingPlatform(i, 0, 50, 20, 100, 2) for i in range(count)], count)
+        plain = bytes_per_item(lambda: [DictPlatform(i, 0, 50, 20) for i in range(count)], count)
+        level_data = build_level_data(count)
+        level = bytes_per_item(lambda: Level(level_data), count)
+        print(f"{count:>9} {slotted:>10.0f} {moving:>15.0f} {plain:>18.0f} {level:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Time the player and level physics on synthetic levels of growing size.
+
+Each level is generated from a fixed seed (a long ground strip plus random
+normal, moving and spike platforms at constant density), and the player is
+driven by the same scripted action stream, so numbers from different
+commits are comparable. Reports the best-of-``REPEATS`` time per tick in
+nanoseconds and the memory allocated within a tick. Run with
+
+    python -m benchmarks.physics_benchmark
+    python -m benchmarks.physics_benchmark --output before.json
+    python -m benchmarks.physics_benchmark --compare before.json
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.allocation_check import ACTION_CYCLE, measure_allocations
+from src.headless import init_headless_display
+
+SIZES = [10, 100, 1000, 10000, 100000]
+TICKS = 2000
+REPEATS = 5
+ALLOCATION_TICKS = 500
+SEED = 1234
+# Horizontal space per platform, so collisions per query stay constant with size
+PIXELS_PER_PLATFORM = 60
+MOVING_FRACTION = 0.1
+SPIKE_FRACTION = 0.02
+# Slowdown versus the --compare baseline that counts as a regression
+REGRESSION_THRESHOLD = 1.2
+
+
+def build_level_data(count, seed=SEED):
+    """Level dict with ``count`` platforms (the ground included)"""
+    rng = np.random.default_rng(seed)
+    width = max(800, count * PIXELS_PER_PLATFORM)
+    platforms = [{"x": 0, "y": 500, "width": width, "height": 100, "type": "normal"}]
+    kinds = rng.random(count - 1)
+    xs = rng.integers(300, width, count - 1)
+    ys = rng.integers(150, 420, count - 1)
+    widths = rng.integers(40, 200, count - 1)
+    for kind, x, y, w in zip(kinds.tolist(), xs.tolist(), ys.tolist(), widths.tolist()):
+        platform = {"x": x, "y": y, "width": w, "height": 20, "type": "normal"}
+        if kind < MOVING_FRACTION:
+            platform.update(type="moving", move_distance=100, speed=2)
+        elif kind < MOVING_FRACTION + SPIKE_FRACTION:
+            platform.update(type="spike", height=10)
+        platforms.append(platform)
+    return {"spawn_point": [100, 400], "exit_point": [width + 100, 450], "platforms": platforms}
+
+
+def ns_per_tick(tick, ticks=TICKS, repeats=REPEATS):
+    """Best of ``repeats`` runs of ``ticks`` calls of ``tick(i)``"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for i in range(ticks):
+            tick(i)
+        elapsed = (time.perf_counter_ns() - start) / ticks
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark_size(count):
+    """Results for one level size: {path: {"ns": .., "alloc_bytes": ..}}"""
+    from src.level_manager import Level, LevelManager
+    from src.simulation import Simulation
+
+    level_data = build_level_data(count)
+    cycle = len(ACTION_CYCLE)
+
+    def fresh_simulation():
+        return Simulation(LevelManager([level_data]))
+
+    # Each path gets its own level and player so earlier runs can't change it
+    sim = fresh_simulation()
+    step = lambda i: sim.step(ACTION_CYCLE[i % cycle])
+
+    update_sim = fresh_simulation()
+    player = update_sim.player
+    level = update_sim.level_manager.get_current_level()
+
+    def player_update(i):
+        colliders = level.get_colliders(player.get_collision_bounds())
+        player.update(ACTION_CYCLE[i % cycle], colliders)
+
+    # The overlap resolvers are timed against the platforms around the spawn
+    # point, from a position overlapping the ground, reset before every call
+    probe_sim = fresh_simulation()
+    probe = probe_sim.player
+    spawn_x, spawn_y = level_data["spawn_point"]
+    probe_colliders = list(probe_sim.level_manager.get_current_level().get_colliders(probe.get_collision_bounds()))
+
+    def horizontal(i):
+        probe.rect.x = spawn_x
+        probe.rect.y = spawn_y + 10
+        probe.velocity_x = 5
+        probe._handle_horizontal_collisions(probe_colliders)
+
+    def vertical(i):
+        probe.rect.x = spawn_x
+        probe.rect.y = spawn_y + 10
+        probe.velocity_y = 5
+        probe._handle_vertical_collisions(probe_colliders)
+
+    level_only = Level(level_data)
+
+    paths = {
+        "Simulation.step": step,
+        "get_colliders + Player.update": player_update,
+        "_handle_horizontal_collisions": horizontal,
+        "_handle_vertical_collisions": vertical,
+        "Level.update": lambda i: level_only.update(),
+    }
+    results = {}
+    for name, tick in paths.items():
+        _, transient = measure_allocations(tick, ALLOCATION_TICKS, warmup=10)
+        results[name] = {"ns": ns_per_tick(tick), "alloc_bytes": transient}
+    return results
+
+
+def print_results(results, baseline=None):
+    """Table of results; with a baseline, adds the ratio and returns the regressions"""
+    regressions = []
+    header = f"{'platforms':>9}  {'path':<30} {'ns/tick':>12} {'alloc B/tick':>12}"
+    print(header + (f" {'vs base':>8}" if baseline else ""))
+    for count, paths in results.items():
+        for name, result in paths.items():
+            line = f"{count:>9}  {name:<30} {result['ns']:>12.0f} {result['alloc_bytes']:>12}"
+            base = (baseline or {}).get(count, {}).get(name)
+            if base:
+                ratio = result["ns"] / base["ns"]
+                flag = " !" if ratio > REGRESSION_THRESHOLD else ""
+                line += f" {ratio:>7.2f}x{flag}"
+                if flag:
+                    regressions.append((count, name, ratio))
+            print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark player and level physics")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="platform counts to test")
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--compare", help="JSON results from an earlier run to compare against")
+    args = parser.parse_args()
+
+    init_headless_display()
+    results = {}
+    for count in args.sizes:
+        results[str(count)] = benchmark_size(count)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    regressions = print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if regressions:
+        print(f"\n{len(regressions)} path(s) more than {REGRESSION_THRESHOLD - 1:.0%} slower than the baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
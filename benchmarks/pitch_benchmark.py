@@ -0,0 +1,71 @@
+"""Check that pitch estimation fits in the audio callback time budget.
+
+The callback must finish one hop of audio before the next hop arrives, so the
+budget per block is ``HOP_SIZE / SAMPLE_RATE``. Run with
+
+    python -m benchmarks.pitch_benchmark
+"""
+
+import time
+
+import numpy as np
+
+from config.settings import HOP_SIZE, SAMPLE_RATE
+from src.audio_analysis import AnalysisPlan, FEATURE_SIZE
+from src.pitch import PitchEstimator
+
+WINDOW_SIZES = [1024, 2048, 4096, 8192, 16384]
+REPEATS = 500
+
+
+def time_per_call(func, repeats=REPEATS):
+    """Per-call times in microseconds"""
+    func()  # warm up caches and FFT plans
+    times = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        func()
+        times[i] = time.perf_counter() - start
+    return times * 1e6
+
+
+def main():
+    budget_us = HOP_SIZE / SAMPLE_RATE * 1e6
+    rng = np.random.default_rng(0)
+    print(f"Callback budget: {budget_us:.0f} us per {HOP_SIZE}-sample hop at {SAMPLE_RATE} Hz\n")
+    print(f"{'window':>8} {'pitch Hz':>9} {'pitch p50':>10} {'pitch p99':>10} {'block p50':>10} {'block p99':>10} "
+          f"{'budget used':>12}")
+
+    over_budget = False
+    no_pitch = []
+    for window_size in WINDOW_SIZES:
+        t = np.arange(window_size) / SAMPLE_RATE
+        window = (0.5 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(window_size)).astype(np.float32)
+        hop = window[-HOP_SIZE:]
+
+        plan = AnalysisPlan(SAMPLE_RATE, window_size, (1000, 3000), (100, 400))
+        estimator = PitchEstimator(SAMPLE_RATE, plan.pitch_estimator.min_freq, plan.pitch_estimator.max_freq)
+        out = np.zeros(FEATURE_SIZE)
+
+        frequency, confidence = estimator.estimate(window)
+        block = time_per_call(lambda: plan.analyze(hop, out, window))
+        used = np.percentile(block, 99) / budget_us
+        over_budget |= used > 1
+        if confidence > 0:
+            pitch = time_per_call(lambda: estimator.estimate(window))
+            pitch_columns = f"{frequency:>9.1f} {np.median(pitch):>8.0f}us {np.percentile(pitch, 99):>8.0f}us"
+        else:
+            # Nothing was estimated, so a time here would be meaningless
+            no_pitch.append(window_size)
+            pitch_columns = f"{'none':>9} {'-':>10} {'-':>10}"
+        print(f"{window_size:>8} {pitch_columns} {np.median(block):>8.0f}us {np.percentile(block, 99):>8.0f}us "
+              f"{used:>11.0%}")
+
+    if no_pitch:
+        print(f"\nWARNING: no pitch (zero confidence) for windows {no_pitch}; "
+              f"YIN needs at least {estimator.frame_size} samples")
+    if over_budget:
+        print("\nWARNING: p99 block analysis exceeds the callback budget")
+
+if __name__ == "__main__":
+    main()
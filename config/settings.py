@@ -5,8 +5,11 @@ import pygame
 # Window settings
 WINDOW_WIDTH = 1280
 WINDOW_HEIGHT = 720
-FPS = 60
+FPS = 60  # render frame cap (0 = uncapped); physics runs at TICK_RATE
+TICK_RATE = 60  # fixed simulation ticks per second
+MAX_FRAME_TIME = 0.25  # longest frame (s) the simulation catches up on
 TITLE = "Scream Game"
+RENDER_QUALITY = "fast"  # window scaling: "fast" (nearest), "smooth" (filtered) or "integer" (whole multiples, letterboxed)
 
 # Colors
 BLACK = (0, 0, 0)
@@ -25,6 +28,7 @@ JUMP_STRENGTH = 15
 DOUBLE_JUMP_STRENGTH = 12
 DASH_SPEED = 15
 DASH_DURATION = 0.3
+DASH_TICKS = round(DASH_DURATION * TICK_RATE)
 GRAVITY = 0.8
 MAX_FALL_SPEED = 15
 FRICTION = 0.85
@@ -32,7 +36,8 @@ AIR_RESISTANCE = 0.95
 
 # Sound settings
 SAMPLE_RATE = 44100
-WINDOW_SIZE = 2048
+WINDOW_SIZE = 2048  # FFT analysis window
+HOP_SIZE = 512  # samples per audio block; decisions update every hop (WINDOW_SIZE disables overlap)
 HISTORY_SIZE = 10
 CALIBRATION_TIME = 3  # seconds
 
@@ -46,6 +51,8 @@ WHISTLE_MIN_FREQ = 2000
 WHISTLE_MAX_FREQ = 4000
 HUM_MIN_FREQ = 100
 HUM_MAX_FREQ = 400
+USE_PITCH_DETECTION = False  # YIN pitch instead of raw FFT peaks for whistle/hum (needs WINDOW_SIZE >= 1104)
+AUDIO_IN_SEPARATE_PROCESS = False  # capture and analyse audio in a child process
 
 # Platform settings
 PLATFORM_COLORS = {
@@ -55,6 +62,9 @@ PLATFORM_COLORS = {
     'hazard': (255, 50, 50)
 }
 
+# Collision broadphase grid cell size (pixels)
+COLLISION_CELL_SIZE = 128
+
 # Debug settings
 SHOW_HITBOXES = False
 SHOW_SOUND_DEBUG = False
@@ -65,8 +75,10 @@ BUTTON_HEIGHT = 50
 BUTTON_COLOR = (50, 50, 50)
 BUTTON_HOVER_COLOR = (70, 70, 70)
 BUTTON_TEXT_COLOR = WHITE
-BUTTON_FONT_SIZE = 32
-TITLE_FONT_SIZE = 64
+BUTTON_FONT_SIZE = 36
+TITLE_FONT_SIZE = 74
+TEXT_FONT_SIZE = 48  # scores and calibration messages
+TEXT_CACHE_SIZE = 128  # rendered UI strings kept by src.fonts
 
 # Initialize pygame fonts
 pygame.font.init()
@@ -78,15 +90,21 @@ except pygame.error:
     GAME_FONT = pygame.font.SysFont('arial', BUTTON_FONT_SIZE)
     TITLE_FONT = pygame.font.SysFont('arial', TITLE_FONT_SIZE)
 
-# Default Sound Thresholds
-DEFAULT_NOISE_FLOOR = 0.03
-DEFAULT_WALK_THRESHOLD = 0.06
+# Default Sound Thresholds (used until calibration or a tuned profile replaces them)
+DEFAULT_NOISE_FLOOR = 0.05
+DEFAULT_WALK_THRESHOLD = 0.1
 DEFAULT_JUMP_THRESHOLD = 0.2
 DEFAULT_DASH_THRESHOLD = 0.15
+DEFAULT_ACTION_COOLDOWN = 0.1  # seconds between actions
+DEFAULT_SUSTAINED_THRESHOLD = 0.05  # seconds a sound must be sustained
+SOUND_PROFILE_PATH = None  # e.g. "venue.json" written by src.threshold_tuner --output
 
 # Physics
 WALL_SLIDE_SPEED = 2
 
 # Debug
 DEBUG = True
-SHOW_SOUND_LEVELS = True 
\ No newline at end of file
+SHOW_SOUND_LEVELS = True
+LATENCY_REPORT_PATH = None  # e.g. "latency.json" to dump input latency histograms at exit 
+SESSION_RECORDING_PATH = None  # e.g. "session.scrm" to save the session's actions for replay
+RECORD_AUDIO_FEATURES = False  # also store per-tick intensity and frequency in the recording
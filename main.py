@@ -1,10 +1,16 @@
 import pygame
 import sys
+import time
 from config.settings import *
 from src.game_state import GameStateManager, GameState
 from src.sound_processor import SoundProcessor
-from src.player import Player
-from src.level_manager import LevelManager
+from src.latency import LatencyTracker
+from src import simulation
+from src.recording import SessionRecorder
+from src.renderer import DirtyRectRenderer, RenderTarget
+
+# Area _draw_sound_debug draws into
+SOUND_DEBUG_RECT = pygame.Rect(WINDOW_WIDTH - 70, WINDOW_HEIGHT - 122, 70, 104)
 
 class Game:
     def __init__(self):
@@ -13,40 +19,53 @@ class Game:
         
         # Make window resizable
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.RESIZABLE)
-        self.current_width = WINDOW_WIDTH
-        self.current_height = WINDOW_HEIGHT
-        self.scale_factor = 1.0
         
         # Create a virtual surface for the game
         self.virtual_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+        # While playing, only the areas that changed are redrawn and presented
+        self.renderer = DirtyRectRenderer(self.virtual_surface.get_rect())
+        self._drawn_state = None
+        self._drawn_level = None
         
         self.clock = pygame.time.Clock()
         self.running = True
         
         # Initialize game components
+        self.latency_tracker = LatencyTracker()
         self.sound_processor = SoundProcessor(
             sample_rate=SAMPLE_RATE,
             window_size=WINDOW_SIZE,
-            history_size=HISTORY_SIZE
+            hop_size=HOP_SIZE,
+            history_size=HISTORY_SIZE,
+            use_pitch=USE_PITCH_DETECTION,
+            separate_process=AUDIO_IN_SEPARATE_PROCESS,
+            latency_tracker=self.latency_tracker
         )
+        if SOUND_PROFILE_PATH:
+            self.sound_processor.load_profile(SOUND_PROFILE_PATH)
         
         self.state_manager = GameStateManager(WINDOW_WIDTH, WINDOW_HEIGHT)
-        self.level_manager = LevelManager()
         
-        # Create player at spawn point
-        current_level = self.level_manager.get_current_level()
-        spawn_x, spawn_y = current_level.spawn_point
-        self.player = Player(spawn_x, spawn_y)
+        # Player and levels, created at the first level's spawn point
+        self.simulation = simulation.Simulation()
+        self.level_manager = self.simulation.level_manager
+        self.player = self.simulation.player
+        self.recorder = None
+        if SESSION_RECORDING_PATH:
+            self.recorder = SessionRecorder(self.level_manager.current_level_index,
+                                            record_features=RECORD_AUDIO_FEATURES)
         
         # Load background
         try:
-            self.background = pygame.image.load("assets/images/background.png").convert()
-            self.original_background = self.background  # Keep original for proper scaling
+            background = pygame.image.load("assets/images/background.png").convert()
         except pygame.error:
             print("Warning: Could not load background image. Using solid color.")
-            self.background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-            self.background.fill((50, 50, 100))
-            self.original_background = self.background.copy()
+            background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+            background.fill((50, 50, 100))
+            
+        # Scales the virtual surface (and the background) to the window
+        self.render_target = RenderTarget((WINDOW_WIDTH, WINDOW_HEIGHT), (WINDOW_WIDTH, WINDOW_HEIGHT),
+                                          RENDER_QUALITY, background)
             
     def handle_events(self):
         """Process all game events"""
@@ -57,24 +76,14 @@ class Game:
                 
             # Handle window resize
             elif event.type == pygame.VIDEORESIZE:
-                self.current_width = event.w
-                self.current_height = event.h
-                self.screen = pygame.display.set_mode((self.current_width, self.current_height), pygame.RESIZABLE)
-                self.scale_factor = min(self.current_width / WINDOW_WIDTH, self.current_height / WINDOW_HEIGHT)
-                # Scale background properly
-                self.background = pygame.transform.scale(self.original_background, (self.current_width, self.current_height))
+                self.screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
+                self.render_target.resize((event.w, event.h))
+                self.renderer.invalidate()
                 
             # Scale mouse position for UI interaction
             elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION):
-                # Calculate the game view position
-                x_offset = (self.current_width - WINDOW_WIDTH * self.scale_factor) // 2
-                y_offset = (self.current_height - WINDOW_HEIGHT * self.scale_factor) // 2
-                
                 # Adjust mouse position to virtual coordinates
-                event.pos = (
-                    int((event.pos[0] - x_offset) / self.scale_factor),
-                    int((event.pos[1] - y_offset) / self.scale_factor)
-                )
+                event.pos = self.render_target.to_surface(event.pos)
                 
             # Let the state manager handle the event first
             if self.state_manager.handle_event(event):
@@ -87,62 +96,85 @@ class Game:
                         self.state_manager.state = GameState.PAUSED
                         
     def update(self):
-        """Update game state"""
+        """Advance the game by one fixed simulation tick"""
         current_state = self.state_manager.state
-        current_level = self.level_manager.get_current_level()
         
         if current_state == GameState.CALIBRATING:
-            # Handle calibration
-            if self.sound_processor.is_calibrating:
-                self.sound_processor.update_calibration()
-            else:
+            # Handle calibration (polled every frame, never blocks)
+            if not self.sound_processor.is_calibrating:
+                self.sound_processor.start_calibration(self.state_manager.calibration_time)
+            elif self.sound_processor.update_calibration() is not None:
                 self.state_manager.state = GameState.MENU
+            self.state_manager.calibration_time_left = self.sound_processor.get_calibration_time_left()
                 
         elif current_state == GameState.PLAYING:
             # Get action from sound input
             action = self.sound_processor.get_action()
+            action_timing = self.sound_processor.last_action_timing if action != "none" else None
+            if self.recorder is not None:
+                self.recorder.record(action, *self._recorded_features())
             
-            # Update player with all platforms (static and moving)
-            all_platforms = [p.rect for p in current_level.platforms + current_level.moving_platforms]
-            self.player.update(action, all_platforms)
-            
-            # Check for level completion
-            if self.player.rect.colliderect(pygame.Rect(*current_level.exit_point, 30, 30)):
-                if self.level_manager.has_next_level():
-                    self.level_manager.next_level()
-                    new_level = self.level_manager.get_current_level()
-                    spawn_x, spawn_y = new_level.spawn_point
-                    self.player.reset(spawn_x, spawn_y)
-                    self.state_manager.state = GameState.LEVEL_COMPLETE
-                else:
-                    self.state_manager.state = GameState.VICTORY
-                    
-            # Check for death (falling off screen or hitting hazards)
-            if (self.player.rect.top > WINDOW_HEIGHT or
-                any(p.type == "spike" and self.player.rect.colliderect(p.rect)
-                    for p in current_level.platforms)):
+            # Move the player and platforms, then check for exit and death
+            outcome = self.simulation.step(action, action_timing)
+            if outcome == simulation.LEVEL_COMPLETE:
+                self.state_manager.state = GameState.LEVEL_COMPLETE
+            elif outcome == simulation.VICTORY:
+                self.state_manager.state = GameState.VICTORY
+            elif outcome == simulation.GAME_OVER:
                 self.state_manager.state = GameState.GAME_OVER
                 
-        # Update moving platforms
+        elif current_state == GameState.PAUSED:
+            # Moving platforms keep going while paused
+            if self.recorder is not None:
+                self.recorder.record_pause(*self._recorded_features())
+            self.simulation.pause_step()
+            
+    def _recorded_features(self):
+        """Intensity and dominant frequency for the session recording"""
+        if not self.recorder.record_features:
+            return 0.0, 0.0
+        return self.sound_processor.current_intensity, self.sound_processor.get_dominant_frequency()
+            
+    def draw(self, alpha=1.0):
+        """Draw the game screen, interpolating ``alpha`` of the way into the next tick"""
+        current_state = self.state_manager.state
+        current_level = self.level_manager.get_current_level()
+        if current_state != self._drawn_state or current_level is not self._drawn_level:
+            self.renderer.invalidate()
+            self._drawn_state = current_state
+            self._drawn_level = current_level
+            
+        # Everything that can change between frames of the same screen
         if current_state in [GameState.PLAYING, GameState.PAUSED]:
-            current_level.update()
+            # Moving platforms keep going while paused
+            self.renderer.mark(self.player.get_draw_rect(alpha))
+            for rect in current_level.get_moving_draw_rects(self.virtual_surface.get_rect(), alpha):
+                self.renderer.mark(rect)
+        if SHOW_SOUND_DEBUG and current_state in [GameState.PLAYING, GameState.CALIBRATING]:
+            self.renderer.mark(SOUND_DEBUG_RECT)
+        for rect in self.state_manager.pop_changed_rects():
+            self.renderer.mark(rect)
             
-    def draw(self):
-        """Draw the game screen"""
-        # Clear both surfaces
-        self.screen.fill((0, 0, 0))
-        self.virtual_surface.fill((0, 0, 0))
-        
-        # Draw background (scaled to actual window size)
-        self.screen.blit(self.background, (0, 0))
+        if not self.renderer.full_redraw:
+            self._draw_dirty(alpha)
+        else:
+            self._draw_full(alpha)
+        self.renderer.end_frame()
         
+        # The presented frame is the first to show the player's latest action
+        action_timing = self.player.pop_action_timing()
+        if action_timing is not None:
+            self.latency_tracker.record_frame(action_timing, time.perf_counter())
+            
+    def _draw_scene(self, alpha):
+        """Draw the current state onto the virtual surface, within its clip area"""
         current_state = self.state_manager.state
         
         # Draw game elements on virtual surface
         if current_state in [GameState.PLAYING, GameState.PAUSED]:
             current_level = self.level_manager.get_current_level()
-            current_level.draw(self.virtual_surface)
-            self.player.draw(self.virtual_surface)
+            current_level.draw(self.virtual_surface, alpha)
+            self.player.draw(self.virtual_surface, alpha)
             
         # Draw sound debug info if enabled
         if SHOW_SOUND_DEBUG and current_state in [GameState.PLAYING, GameState.CALIBRATING]:
@@ -151,18 +183,34 @@ class Game:
         # Draw UI elements
         self.state_manager.draw(self.virtual_surface)
         
-        # Scale virtual surface to fit the window
-        scaled_surface = pygame.transform.scale(self.virtual_surface,
-                                              (int(WINDOW_WIDTH * self.scale_factor),
-                                               int(WINDOW_HEIGHT * self.scale_factor)))
+    def _draw_full(self, alpha):
+        """Redraw and present the whole window"""
+        # Clear both surfaces
+        self.screen.fill((0, 0, 0))
+        self.virtual_surface.fill((0, 0, 0))
         
-        # Center the scaled surface on screen
-        x_offset = (self.current_width - scaled_surface.get_width()) // 2
-        y_offset = (self.current_height - scaled_surface.get_height()) // 2
-        self.screen.blit(scaled_surface, (x_offset, y_offset))
+        # Draw background (scaled to actual window size)
+        self.screen.blit(self.render_target.background, (0, 0))
+        
+        self._draw_scene(alpha)
+        
+        # Scale virtual surface to fit the window, centered
+        self.render_target.present(self.screen, self.virtual_surface)
         
         pygame.display.flip()
         
+    def _draw_dirty(self, alpha):
+        """Redraw and present only the regions that changed since the last frame"""
+        regions = self.renderer.regions()
+        for region in regions:
+            self.virtual_surface.set_clip(region)
+            self.virtual_surface.fill((0, 0, 0))
+            self._draw_scene(alpha)
+        self.virtual_surface.set_clip(None)
+        
+        updated = self.render_target.present_regions(self.screen, self.virtual_surface, regions)
+        pygame.display.update(updated)
+        
     def _draw_sound_debug(self, surface):
         """Draw sound debug information"""
         intensity = self.sound_processor.get_current_intensity()
@@ -196,15 +244,33 @@ class Game:
     def cleanup(self):
         """Clean up resources"""
         self.sound_processor.cleanup()
-    pygame.quit()
+        if LATENCY_REPORT_PATH:
+            self.latency_tracker.dump_json(LATENCY_REPORT_PATH)
+        if self.recorder is not None:
+            self.recorder.save(SESSION_RECORDING_PATH)
+        pygame.quit()
         
     def game_loop(self):
-        """Main game loop"""
+        """Main game loop.
+
+        The simulation advances in fixed TICK_RATE steps however long frames
+        take; rendering interpolates between the last two ticks.
+        """
+        tick = 1 / TICK_RATE
+        accumulator = 0.0
+        previous_time = time.perf_counter()
         try:
             while self.running:
                 self.handle_events()
-                self.update()
-                self.draw()
+                
+                now = time.perf_counter()
+                accumulator += min(now - previous_time, MAX_FRAME_TIME)
+                previous_time = now
+                while accumulator >= tick and self.running:
+                    self.update()
+                    accumulator -= tick
+                    
+                self.draw(accumulator / tick)
                 self.clock.tick(FPS)
         finally:
             self.cleanup()
@@ -0,0 +1,134 @@
+import numpy as np
+
+from src.audio_analysis import (FEATURE_INTENSITY, FEATURE_PEAKS, FEATURE_PITCH,
+                                FEATURE_PITCH_CONFIDENCE, FEATURE_TIMESTAMP)
+
+ACTIONS = ("none", "walk", "jump", "dash", "crouch")
+ACTION_NONE, ACTION_WALK, ACTION_JUMP, ACTION_DASH, ACTION_CROUCH = range(len(ACTIONS))
+_ACTION_NAMES = np.array(ACTIONS)
+
+
+def _first_at_least(timestamps, lo, reference, delay):
+    """First index >= lo where ``timestamps[i] - reference >= delay``.
+
+    Uses the same subtraction as the live path so float rounding agrees.
+    """
+    n = len(timestamps)
+    i = max(lo, int(np.searchsorted(timestamps, reference + delay, side="left")))
+    while i < n and timestamps[i] - reference < delay:
+        i += 1
+    while i > lo and timestamps[i - 1] - reference >= delay:
+        i -= 1
+    return i
+
+
+def _fire_mask(timestamps, above, cooldown, sustained):
+    """Which calls pass the cooldown and sustain gate of get_action().
+
+    The gate is a recurrence over calls, but between decisions it only ever
+    skips ahead, so each iteration jumps straight to the next call that can
+    change state. Iterations scale with the number of actions, not blocks.
+    """
+    n = len(timestamps)
+    fired = np.zeros(n, dtype=bool)
+    above_idx = np.flatnonzero(above)
+    below_idx = np.flatnonzero(~above)
+
+    last_action_time = -np.inf
+    action_start_time = None
+    i = 0
+    while i < n:
+        # Cooldown: nothing changes until it has elapsed
+        if timestamps[i] - last_action_time < cooldown:
+            i = _first_at_least(timestamps, i + 1, last_action_time, cooldown)
+            continue
+
+        # Quiet call: resets the sustain timer, skip to the next loud one
+        if not above[i]:
+            action_start_time = None
+            k = np.searchsorted(above_idx, i)
+            i = above_idx[k] if k < len(above_idx) else n
+            continue
+
+        if action_start_time is None:
+            action_start_time = timestamps[i]
+        elif timestamps[i] - action_start_time < sustained:
+            # Not sustained yet: wait for the sustain time or a quiet call
+            k = np.searchsorted(below_idx, i)
+            next_quiet = below_idx[k] if k < len(below_idx) else n
+            sustained_at = _first_at_least(timestamps, i + 1, action_start_time, sustained)
+            i = min(next_quiet, sustained_at)
+            continue
+
+        fired[i] = True
+        last_action_time = timestamps[i]
+        i += 1
+    return fired
+
+
+def classify_action_codes(timestamps, intensities, peak_frequencies, thresholds, history_size=10):
+    """Vectorized equivalent of SoundProcessor.get_action() over a recording.
+
+    Each row is one get_action() call made right after its block arrived, so
+    the intensity history at row i is the ``history_size`` windows (of
+    ``thresholds["blocks_per_window"]`` rows each) ending at row i.
+    ``peak_frequencies`` has one row of candidate frequencies per call and
+    ``thresholds`` is a dict like SoundProcessor.get_thresholds(). Returns an
+    int8 array of indices into ACTIONS.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    intensities = np.asarray(intensities, dtype=np.float64)
+    peaks = np.asarray(peak_frequencies, dtype=np.float64).reshape(len(intensities), -1)
+    if np.any(np.diff(timestamps) < 0):
+        raise ValueError("timestamps must be non-decreasing")
+
+    fired = _fire_mask(timestamps, intensities > thresholds["noise_floor"],
+                       thresholds["action_cooldown"], thresholds["sustained_threshold"])
+
+    whistle_low, whistle_high = thresholds["whistle_range"]
+    hum_low, hum_high = thresholds["hum_range"]
+    whistle = ((peaks >= whistle_low) & (peaks <= whistle_high)).any(axis=1)
+    hum = ((peaks >= hum_low) & (peaks <= hum_high)).any(axis=1)
+
+    # Walking needs the last three windows of history above the walk threshold
+    loud = intensities >= thresholds["walk_threshold"]
+    walk = np.zeros_like(loud)
+    walk_blocks = 3 * thresholds.get("blocks_per_window", 1)
+    if history_size >= 3 and len(loud) >= walk_blocks:
+        loud_so_far = np.concatenate(([0], np.cumsum(loud)))
+        walk[walk_blocks - 1:] = loud_so_far[walk_blocks:] - loud_so_far[:-walk_blocks] == walk_blocks
+
+    codes = np.select(
+        [whistle & (intensities >= thresholds["dash_threshold"]),
+         hum,
+         intensities >= thresholds["jump_threshold"],
+         walk],
+        [ACTION_DASH, ACTION_CROUCH, ACTION_JUMP, ACTION_WALK],
+        ACTION_NONE
+    ).astype(np.int8)
+    codes[~fired] = ACTION_NONE
+    return codes
+
+
+def classify_actions(timestamps, intensities, peak_frequencies, thresholds, history_size=10):
+    """Like classify_action_codes(), but returns action names"""
+    codes = classify_action_codes(timestamps, intensities, peak_frequencies, thresholds, history_size)
+    return _ACTION_NAMES[codes]
+
+
+def candidate_frequencies(features, thresholds):
+    """The frequencies get_action() checks against the whistle and hum bands.
+
+    Either the raw FFT peaks, or the estimated pitch where it is confident
+    enough (NaN otherwise, which matches no band).
+    """
+    if not thresholds.get("use_pitch"):
+        return features[:, FEATURE_PEAKS]
+    confident = features[:, FEATURE_PITCH_CONFIDENCE] >= thresholds["pitch_confidence"]
+    return np.where(confident, features[:, FEATURE_PITCH], np.nan)[:, None]
+
+
+def classify_features(features, thresholds, history_size=10):
+    """Classify feature rows as returned by SoundProcessor.collect_features()"""
+    return classify_actions(features[:, FEATURE_TIMESTAMP], features[:, FEATURE_INTENSITY],
+                            candidate_frequencies(features, thresholds), thresholds, history_size)
@@ -0,0 +1,69 @@
+import multiprocessing
+from multiprocessing import shared_memory
+
+from src.audio_analysis import FEATURE_SIZE
+from src.audio_source import BufferedAudioSource
+from src.ring_buffer import RingBuffer
+
+
+def _run_analysis(shm_name, capacity, block_size, processor_kwargs, source, stop_event):
+    """Child process: capture and analyse audio into the shared ring"""
+    # Imported here to avoid a circular import with src.sound_processor
+    from src.sound_processor import SoundProcessor
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = RingBuffer(capacity, block_size, FEATURE_SIZE, buffer=shm.buf)
+    processor = SoundProcessor(source=source, ring=ring, **processor_kwargs)
+    try:
+        if isinstance(processor.source, BufferedAudioSource) and not processor.source.realtime:
+            # Software source without its own thread: drive it from here
+            while not stop_event.is_set() and processor.source.pump(1):
+                pass
+        stop_event.wait()
+    finally:
+        processor.cleanup()
+        ring.release()
+        del processor, ring
+        shm.close()
+
+
+class AnalysisProcess:
+    """Runs audio capture and analysis in a child process.
+
+    The child publishes feature rows into a RingBuffer backed by
+    ``multiprocessing.shared_memory``; its ``write_index`` acts as the
+    sequence counter the parent uses to take consistent snapshots, exactly as
+    it does with the in-process ring. Block timestamps come from
+    ``time.perf_counter()``, which is system-wide, so latency measurements
+    still line up across the two processes.
+    """
+
+    def __init__(self, capacity, block_size, processor_kwargs, source=None):
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=RingBuffer.nbytes(capacity, block_size, FEATURE_SIZE))
+        self.ring = RingBuffer(capacity, block_size, FEATURE_SIZE, buffer=self.shm.buf)
+        self.ring.write_index = 0
+
+        self.stop_event = multiprocessing.Event()
+        self.process = multiprocessing.Process(
+            target=_run_analysis,
+            args=(self.shm.name, capacity, block_size, processor_kwargs, source, self.stop_event),
+            daemon=True
+        )
+
+    def start(self):
+        self.process.start()
+
+    def close(self):
+        """Stop the child and free the shared memory"""
+        self.stop_event.set()
+        if self.process.is_alive():
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        if self.shm is not None:
+            self.ring.release()
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
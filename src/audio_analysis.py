@@ -0,0 +1,130 @@
+import numpy as np
+from scipy.fft import rfft, rfftfreq
+
+from src.pitch import PitchEstimator
+
+# Layout of the per-block feature vector produced by AnalysisPlan
+N_PEAKS = 5
+FEATURE_INTENSITY = 0
+FEATURE_PEAKS = slice(1, 1 + N_PEAKS)
+FEATURE_WHISTLE_ENERGY = 1 + N_PEAKS
+FEATURE_HUM_ENERGY = 2 + N_PEAKS
+FEATURE_TIMESTAMP = 3 + N_PEAKS  # perf_counter() at block arrival, set by the capturer
+FEATURE_PITCH = 4 + N_PEAKS
+FEATURE_PITCH_CONFIDENCE = 5 + N_PEAKS
+FEATURE_SIZE = 6 + N_PEAKS
+
+
+class AnalysisPlan:
+    """Precomputed spectral analysis for fixed-size audio blocks.
+
+    Everything that only depends on the sample rate, window size and frequency
+    bands (Hann window, rfft bin frequencies, band bins) is built once, so each
+    block costs one windowed real FFT plus a handful of O(n) reductions.
+    """
+
+    def __init__(self, sample_rate, window_size, whistle_range, hum_range):
+        self.sample_rate = sample_rate
+        self.window_size = window_size
+
+        self.window = np.hanning(window_size)
+        self.frequencies = rfftfreq(window_size, 1 / sample_rate)
+        self.whistle_mask = self._band_mask(whistle_range)
+        self.hum_mask = self._band_mask(hum_range)
+
+        # rfft bins are sorted by frequency, so each band is a contiguous slice
+        self.whistle_bins = self._mask_to_slice(self.whistle_mask)
+        self.hum_bins = self._mask_to_slice(self.hum_mask)
+
+        # Fundamental frequency over the span of both action bands
+        self.pitch_estimator = PitchEstimator(
+            sample_rate,
+            min_freq=0.8 * min(whistle_range[0], hum_range[0]),
+            max_freq=1.25 * max(whistle_range[1], hum_range[1])
+        )
+        # YIN needs two periods of the lowest frequency inside one window
+        self.pitch_available = window_size >= self.pitch_estimator.frame_size
+
+        # Scratch buffers reused for every block
+        self._windowed = np.empty(window_size)
+        self._spectrum = np.empty(len(self.frequencies))
+
+    def _band_mask(self, band):
+        low, high = band
+        return (self.frequencies >= low) & (self.frequencies <= high)
+
+    @staticmethod
+    def _mask_to_slice(mask):
+        bins = np.flatnonzero(mask)
+        if len(bins) == 0:
+            return slice(0, 0)
+        return slice(bins[0], bins[-1] + 1)
+
+    def analyze(self, block, out, window=None):
+        """Fill ``out`` (length FEATURE_SIZE) with the features of one block.
+
+        The intensity is always measured on ``block``. Spectral features are
+        measured on ``window`` (the block itself by default); they need a full
+        analysis window and are left untouched when it is shorter.
+        """
+        out[FEATURE_INTENSITY] = np.sqrt(np.dot(block, block) / len(block)) if len(block) else 0.0
+
+        if window is None:
+            window = block
+        if len(window) < self.window_size:
+            return out
+
+        np.multiply(window[:self.window_size], self.window, out=self._windowed)
+        spectrum = self._spectrum
+        np.abs(rfft(self._windowed), out=spectrum)
+
+        # Strongest bins, weakest first like a tail of argsort
+        top = np.argpartition(spectrum, -N_PEAKS)[-N_PEAKS:]
+        top = top[np.argsort(spectrum[top])]
+        out[FEATURE_PEAKS] = self.frequencies[top]
+        if self.pitch_available:
+            out[FEATURE_PITCH], out[FEATURE_PITCH_CONFIDENCE] = self.pitch_estimator.estimate(window)
+
+        # Band energies as a share of the total power
+        power = np.square(spectrum, out=spectrum)
+        total = power.sum()
+        if total > 0:
+            out[FEATURE_WHISTLE_ENERGY] = power[self.whistle_bins].sum() / total
+            out[FEATURE_HUM_ENERGY] = power[self.hum_bins].sum() / total
+        else:
+            out[FEATURE_WHISTLE_ENERGY] = 0.0
+            out[FEATURE_HUM_ENERGY] = 0.0
+        return out
+
+
+class SlidingWindow:
+    """The newest ``window_size`` samples of a stream of short hop blocks.
+
+    Samples are written twice into a buffer of twice the window length, so the
+    current window is always one contiguous slice and pushing a hop never
+    shifts the existing samples.
+    """
+
+    def __init__(self, window_size):
+        self.window_size = window_size
+        self.buffer = np.zeros(2 * window_size, dtype=np.float32)
+        self.position = 0  # index of the oldest sample in the window
+        self.filled = 0
+
+    def push(self, block):
+        size = self.window_size
+        block = block[-size:]
+        n = len(block)
+        head = min(n, size - self.position)
+        for offset in (0, size):
+            start = self.position + offset
+            self.buffer[start:start + head] = block[:head]
+            self.buffer[offset:offset + n - head] = block[head:]
+        self.position = (self.position + n) % size
+        self.filled = min(self.filled + n, size)
+
+    def view(self):
+        """The window oldest sample first, or None until it has filled up"""
+        if self.filled < self.window_size:
+            return None
+        return self.buffer[self.position:self.position + self.window_size]
@@ -0,0 +1,268 @@
+import threading
+import time
+import wave
+
+import numpy as np
+
+try:
+    import sounddevice as sd
+except (ImportError, OSError):
+    # No PortAudio on this machine; only the software sources are usable
+    sd = None
+
+
+class StreamTime:
+    """Mutable stand-in for the time info sounddevice passes to callbacks"""
+
+    def __init__(self):
+        self.inputBufferAdcTime = 0.0
+        self.currentTime = 0.0
+        self.outputBufferDacTime = 0.0
+
+
+class AudioSource:
+    """Something that delivers mono sample blocks to a sounddevice-style callback.
+
+    ``open`` binds the source to ``callback(indata, frames, time, status)``,
+    where ``indata`` has shape ``(frames, 1)``. ``start``/``stop`` control the
+    flow of blocks and ``close`` releases any resources.
+    """
+
+    def __init__(self):
+        self.callback = None
+        self.sample_rate = None
+        self.block_size = None
+
+    def open(self, callback, sample_rate, block_size):
+        self.callback = callback
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+
+    def start(self):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+    def close(self):
+        self.stop()
+
+
+class LiveAudioSource(AudioSource):
+    """Microphone input through a sounddevice InputStream"""
+
+    def __init__(self, device=None):
+        super().__init__()
+        self.device = device
+        self.stream = None
+
+    def open(self, callback, sample_rate, block_size):
+        if sd is None:
+            raise RuntimeError("sounddevice/PortAudio is not available; use a file, array or synthetic source")
+        super().open(callback, sample_rate, block_size)
+        self.stream = sd.InputStream(
+            device=self.device,
+            channels=1,
+            samplerate=sample_rate,
+            callback=callback,
+            blocksize=block_size
+        )
+
+    def start(self):
+        self.stream.start()
+
+    def stop(self):
+        if self.stream:
+            self.stream.stop()
+
+    def close(self):
+        if self.stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+
+class BufferedAudioSource(AudioSource):
+    """Base for sources that produce their samples in software.
+
+    With ``realtime=True``, ``start`` runs a background thread that paces
+    blocks at the stream's sample rate, like a microphone would. With
+    ``realtime=False`` nothing happens on ``start``; the caller drives the
+    source with ``pump``, which pushes blocks through the callback as fast as
+    it can consume them.
+    """
+
+    def __init__(self, realtime=True):
+        super().__init__()
+        self.realtime = realtime
+        self.position = 0  # samples delivered so far
+        self._block = None
+        self._time_info = StreamTime()
+        self._thread = None
+        self._stop_event = None  # created on start so idle sources stay picklable
+
+    def open(self, callback, sample_rate, block_size):
+        super().open(callback, sample_rate, block_size)
+        self._block = np.zeros((block_size, 1), dtype=np.float32)
+
+    def read_block(self, out):
+        """Fill ``out`` (1-D, block_size) and return the number of frames written.
+
+        Returning 0 ends the stream.
+        """
+        raise NotImplementedError
+
+    def pump(self, max_blocks=None):
+        """Deliver up to ``max_blocks`` blocks synchronously; return the count"""
+        delivered = 0
+        while max_blocks is None or delivered < max_blocks:
+            if not self._deliver_block():
+                break
+            delivered += 1
+        return delivered
+
+    def _deliver_block(self):
+        block = self._block
+        frames = self.read_block(block[:, 0])
+        if frames <= 0:
+            return False
+        if frames < self.block_size:
+            block[frames:, 0] = 0
+
+        stream_time = self.position / self.sample_rate
+        self._time_info.inputBufferAdcTime = stream_time
+        self._time_info.currentTime = stream_time
+        self.callback(block[:frames], frames, self._time_info, None)
+        self.position += frames
+        return True
+
+    def start(self):
+        if not self.realtime or self._thread is not None:
+            return
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        block_duration = self.block_size / self.sample_rate
+        next_time = time.perf_counter()
+        while not self._stop_event.is_set():
+            if not self._deliver_block():
+                break
+            next_time += block_duration
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                self._stop_event.wait(delay)
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+
+class ArraySource(BufferedAudioSource):
+    """Plays back an in-memory array of mono samples"""
+
+    def __init__(self, samples, realtime=True, loop=False):
+        super().__init__(realtime)
+        self.samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        self.loop = loop
+
+    def read_block(self, out):
+        if self.loop and len(self.samples):
+            start = self.position % len(self.samples)
+            written = 0
+            while written < len(out):
+                chunk = min(len(out) - written, len(self.samples) - start)
+                out[written:written + chunk] = self.samples[start:start + chunk]
+                written += chunk
+                start = 0
+            return written
+
+        chunk = self.samples[self.position:self.position + len(out)]
+        out[:len(chunk)] = chunk
+        return len(chunk)
+
+
+class WavFileSource(BufferedAudioSource):
+    """Streams a PCM WAV file, mixing multiple channels down to mono"""
+
+    _SCALES = {1: 128.0, 2: 32768.0, 4: 2147483648.0}
+    _DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+    def __init__(self, path, realtime=True):
+        super().__init__(realtime)
+        self.path = path
+        self._wav = wave.open(str(path), "rb")
+        self.channels = self._wav.getnchannels()
+        self.sample_width = self._wav.getsampwidth()
+        self.file_sample_rate = self._wav.getframerate()
+        if self.sample_width not in self._DTYPES:
+            self._wav.close()
+            raise ValueError(f"Unsupported WAV sample width: {self.sample_width * 8} bits")
+
+    def open(self, callback, sample_rate, block_size):
+        if sample_rate != self.file_sample_rate:
+            raise ValueError(
+                f"{self.path} is sampled at {self.file_sample_rate} Hz, expected {sample_rate} Hz"
+            )
+        super().open(callback, sample_rate, block_size)
+
+    def read_block(self, out):
+        raw = self._wav.readframes(len(out))
+        data = np.frombuffer(raw, dtype=self._DTYPES[self.sample_width])
+        frames = len(data) // self.channels
+        if frames == 0:
+            return 0
+
+        data = data[:frames * self.channels].reshape(frames, self.channels)
+        if self.channels > 1:
+            np.mean(data, axis=1, out=out[:frames])
+        else:
+            out[:frames] = data[:, 0]
+        if self.sample_width == 1:
+            out[:frames] -= 128.0  # 8-bit WAV is unsigned
+        out[:frames] /= self._SCALES[self.sample_width]
+        return frames
+
+    def close(self):
+        super().close()
+        self._wav.close()
+
+    def __getstate__(self):
+        # Open files don't pickle; reopen by path (e.g. in an analysis process)
+        state = self.__dict__.copy()
+        del state["_wav"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._wav = wave.open(str(self.path), "rb")
+        self._wav.setpos(self.position)
+
+
+class SyntheticSource(BufferedAudioSource):
+    """Generates a sine tone plus white noise, optionally for a fixed duration"""
+
+    def __init__(self, frequency=440.0, amplitude=0.5, noise_level=0.0,
+                 duration=None, seed=None, realtime=True):
+        super().__init__(realtime)
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.noise_level = noise_level
+        self.duration = duration
+        self.rng = np.random.default_rng(seed)
+
+    def read_block(self, out):
+        frames = len(out)
+        if self.duration is not None:
+            frames = min(frames, int(self.duration * self.sample_rate) - self.position)
+            if frames <= 0:
+                return 0
+
+        t = (self.position + np.arange(frames)) / self.sample_rate
+        out[:frames] = self.amplitude * np.sin(2 * np.pi * self.frequency * t)
+        if self.noise_level:
+            out[:frames] += self.noise_level * self.rng.standard_normal(frames)
+        return frames
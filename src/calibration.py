@@ -0,0 +1,127 @@
+import math
+
+
+class P2Quantile:
+    """Streaming quantile estimate using the P-square algorithm (Jain & Chlamtac).
+
+    Keeps five markers regardless of how many values are added.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        self.count += 1
+        q = self.heights
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+
+        n = self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        q = self.heights
+        n = self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self):
+        if not self.heights:
+            return 0.0
+        if self.count <= 5:
+            # Too few values for the markers; use the exact order statistic
+            index = min(int(round(self.p * (self.count - 1))), self.count - 1)
+            return self.heights[index]
+        return self.heights[2]
+
+
+class StreamingCalibrator:
+    """Incremental ambient-noise calibration that the frame loop can poll.
+
+    Tracks a running mean and variance (Welford) and approximate percentiles
+    in constant memory, and reports when ``duration`` seconds have passed.
+    """
+
+    def __init__(self, duration, percentiles=(0.5, 0.95)):
+        self.duration = duration
+        self.start_time = None
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.quantiles = {p: P2Quantile(p) for p in percentiles}
+
+    def start(self, now):
+        self.start_time = now
+
+    def add(self, value):
+        """Add one intensity sample"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        for quantile in self.quantiles.values():
+            quantile.add(value)
+
+    def time_left(self, now):
+        if self.start_time is None:
+            return self.duration
+        return max(0.0, self.duration - (now - self.start_time))
+
+    def is_done(self, now):
+        return self.start_time is not None and now - self.start_time >= self.duration
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def percentile(self, p):
+        return self.quantiles[p].value()
+
+    def get_stats(self):
+        """Summary of the ambient noise seen so far"""
+        stats = {
+            "samples": self.count,
+            "mean": self.mean,
+            "std": self.std,
+        }
+        for p, quantile in self.quantiles.items():
+            stats[f"p{int(round(p * 100))}"] = quantile.value()
+        return stats
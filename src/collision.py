@@ -0,0 +1,47 @@
+import math
+
+
+def _axis_times(a_min, a_max, b_min, b_max, delta):
+    """Entry and exit times of interval a moving by delta against interval b"""
+    if delta > 0:
+        return (b_min - a_max) / delta, (b_max - a_min) / delta
+    if delta < 0:
+        return (b_max - a_min) / delta, (b_min - a_max) / delta
+    # Not moving on this axis: either always overlapping or never
+    if a_max > b_min and a_min < b_max:
+        return -math.inf, math.inf
+    return math.inf, -math.inf
+
+
+def sweep_aabb(rect, dx, dy, obstacle):
+    """Time of impact of ``rect`` moving by (dx, dy) against a static rect.
+
+    Returns the fraction of the move in [0, 1] after which the two rects
+    touch, or None if they don't meet during the move. Rects that already
+    overlap at the start are not reported; resolve those with an overlap test.
+    """
+    x_entry, x_exit = _axis_times(rect.left, rect.right, obstacle.left, obstacle.right, dx)
+    y_entry, y_exit = _axis_times(rect.top, rect.bottom, obstacle.top, obstacle.bottom, dy)
+    entry = max(x_entry, y_entry)
+    exit_ = min(x_exit, y_exit)
+    if entry >= exit_ or entry < 0 or entry > 1:
+        return None
+    return entry
+
+
+def first_hit(rect, dx, dy, obstacles):
+    """Earliest obstacle ``rect`` runs into while moving by (dx, dy).
+
+    One pass over the candidates; returns ``(time_of_impact, obstacle)`` or
+    ``(None, None)``. Ties go to the obstacle listed first.
+    """
+    best_time = None
+    best = None
+    if not dx and not dy:
+        return best_time, best
+    for obstacle in obstacles:
+        toi = sweep_aabb(rect, dx, dy, obstacle)
+        if toi is not None and (best_time is None or toi < best_time):
+            best_time = toi
+            best = obstacle
+    return best_time, best
@@ -0,0 +1,32 @@
+"""Shared UI fonts and a cache of rendered text.
+
+Fonts are loaded once per size, and rendered strings are kept in an LRU
+cache keyed by (text, size, color), so text is only rasterized again when
+it changes (the calibration countdown, a new score).
+"""
+
+from functools import lru_cache
+
+import pygame
+from config.settings import *
+
+# Fonts by size, starting with the ones settings already loaded
+_fonts = {BUTTON_FONT_SIZE: GAME_FONT, TITLE_FONT_SIZE: TITLE_FONT}
+
+
+def get_font(size):
+    """The default font at ``size``, loaded on first use"""
+    font = _fonts.get(size)
+    if font is None:
+        try:
+            font = pygame.font.Font(None, size)
+        except pygame.error:
+            font = pygame.font.SysFont('arial', size)
+        _fonts[size] = font
+    return font
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(text, size, color):
+    """Antialiased ``text`` in the default font; the surface is shared, so only blit it"""
+    return get_font(size).render(text, True, color)
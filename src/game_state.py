@@ -1,6 +1,7 @@
 import pygame
 from enum import Enum
 from config.settings import *
+from src.fonts import render_text
 
 class GameState(Enum):
     MENU = "menu"
@@ -11,7 +12,12 @@ class GameState(Enum):
     LEVEL_COMPLETE = "level_complete"
     VICTORY = "victory"
 
+# States whose screen is drawn over the darkened game
+OVERLAY_STATES = (GameState.PAUSED, GameState.GAME_OVER, GameState.LEVEL_COMPLETE)
+
 class Button:
+    __slots__ = ("rect", "text", "color", "hover_color", "is_hovered")
+    
     def __init__(self, x, y, width, height, text, color, hover_color):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
@@ -19,12 +25,14 @@ class Button:
         self.hover_color = hover_color
         self.is_hovered = False
         
-    def draw(self, surface):
-        color = self.hover_color if self.is_hovered else self.color
+    def draw(self, surface, hovered=None):
+        """Draw the button; ``hovered`` overrides its current hover state"""
+        if hovered is None:
+            hovered = self.is_hovered
+        color = self.hover_color if hovered else self.color
         pygame.draw.rect(surface, color, self.rect, border_radius=10)
         
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render(self.text, True, WHITE)
+        text_surface = render_text(self.text, BUTTON_FONT_SIZE, BUTTON_TEXT_COLOR)
         text_rect = text_surface.get_rect(center=self.rect.center)
         surface.blit(text_surface, text_rect)
         
@@ -46,7 +54,22 @@ class GameStateManager:
         self.score = 0
         self.high_score = 0
         self.calibration_time = 5  # seconds
-        self.calibration_start = 0
+        # Set by the game from the calibrator's clock while calibrating
+        self.calibration_time_left = 0.0
+        self.new_high_score = False
+        # Each state's screen (backdrop, text and idle buttons),
+        # composed once per state and score; frames blit it and draw the
+        # hovered buttons on top
+        self._screens = {}
+        # Darkens the game under the OVERLAY_STATES screens
+        self._overlay = pygame.Surface((screen_width, screen_height))
+        self._overlay.set_alpha(128)
+        self._overlay.fill(BLACK)
+        self._drawn_state = None
+        # UI areas that changed since pop_changed_rects was last called
+        self._changed_rects = []
+        # Row the calibration countdown is drawn in
+        self._countdown_rect = pygame.Rect(0, 300 - TEXT_FONT_SIZE // 2, screen_width, TEXT_FONT_SIZE)
         
     def setup_ui(self):
         """Setup UI elements for different states"""
@@ -97,149 +120,155 @@ class GameStateManager:
             self._handle_game_over_events(event)
         return True
             
+    def _handle_buttons(self, buttons, event):
+        """Pass ``event`` to ``buttons``; return the name of the one clicked, if any"""
+        clicked = None
+        for button_name, button in buttons.items():
+            was_hovered = button.is_hovered
+            if button.handle_event(event):
+                clicked = button_name
+            if button.is_hovered != was_hovered:
+                self._changed_rects.append(button.rect)
+        return clicked
+        
     def _handle_menu_events(self, event):
         """Handle menu state events"""
-        for button_name, button in self.menu_buttons.items():
-            if button.handle_event(event):
-                if button_name == "start":
-                    self.state = GameState.PLAYING
-                elif button_name == "calibrate":
-                    self.state = GameState.CALIBRATING
-                    self.calibration_start = pygame.time.get_ticks()
-                elif button_name == "quit":
-                    return False
+        button_name = self._handle_buttons(self.menu_buttons, event)
+        if button_name == "start":
+            self.state = GameState.PLAYING
+        elif button_name == "calibrate":
+            self.state = GameState.CALIBRATING
+            self.calibration_time_left = self.calibration_time
+        elif button_name == "quit":
+            return False
         return True
         
     def _handle_pause_events(self, event):
         """Handle pause state events"""
-        for button_name, button in self.pause_buttons.items():
-            if button.handle_event(event):
-                if button_name == "resume":
-                    self.state = GameState.PLAYING
-                elif button_name == "menu":
-                    self.state = GameState.MENU
+        button_name = self._handle_buttons(self.pause_buttons, event)
+        if button_name == "resume":
+            self.state = GameState.PLAYING
+        elif button_name == "menu":
+            self.state = GameState.MENU
                     
     def _handle_game_over_events(self, event):
         """Handle game over state events"""
-        for button_name, button in self.game_over_buttons.items():
-            if button.handle_event(event):
-                if button_name == "retry":
-                    self.state = GameState.PLAYING
-                    self.score = 0
-                elif button_name == "menu":
-                    self.state = GameState.MENU
+        button_name = self._handle_buttons(self.game_over_buttons, event)
+        if button_name == "retry":
+            self.state = GameState.PLAYING
+            self.score = 0
+        elif button_name == "menu":
+            self.state = GameState.MENU
                     
-    def update(self):
-        """Update game state"""
-        if self.state == GameState.CALIBRATING:
-            current_time = pygame.time.get_ticks()
-            if (current_time - self.calibration_start) / 1000 >= self.calibration_time:
-                self.state = GameState.PLAYING
-                
-    def draw(self, surface):
-        """Draw UI elements based on current state"""
+    def _get_buttons(self):
+        """Buttons of the current state"""
         if self.state == GameState.MENU:
-            self._draw_menu(surface)
+            return self.menu_buttons
         elif self.state == GameState.PAUSED:
-            self._draw_pause(surface)
+            return self.pause_buttons
         elif self.state == GameState.GAME_OVER:
-            self._draw_game_over(surface)
-        elif self.state == GameState.CALIBRATING:
-            self._draw_calibration(surface)
-        elif self.state == GameState.LEVEL_COMPLETE:
-            self._draw_level_complete(surface)
-        elif self.state == GameState.VICTORY:
-            self._draw_victory(surface)
+            return self.game_over_buttons
+        return {}
+        
+    def _get_screen(self):
+        """The current state's composed screen, built on first use"""
+        key = (self.state, self.score, self.new_high_score)
+        screen = self._screens.get(key)
+        if screen is None:
+            screen = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+            if self.state == GameState.MENU:
+                self._compose_menu(screen)
+            elif self.state == GameState.PAUSED:
+                self._compose_pause(screen)
+            elif self.state == GameState.GAME_OVER:
+                self._compose_game_over(screen)
+            elif self.state == GameState.CALIBRATING:
+                self._compose_calibration(screen)
+            elif self.state == GameState.LEVEL_COMPLETE:
+                self._compose_level_complete(screen)
+            elif self.state == GameState.VICTORY:
+                self._compose_victory(screen)
+            for button in self._get_buttons().values():
+                button.draw(screen, hovered=False)
+            self._screens[key] = screen
+        return screen
+        
+    def pop_changed_rects(self):
+        """UI areas that changed since the last call, for partial redraws"""
+        rects = self._changed_rects
+        self._changed_rects = []
+        if self.state == GameState.CALIBRATING:
+            rects.append(self._countdown_rect)
+        return rects
+        
+    def draw(self, surface):
+        """Draw UI elements based on current state"""
+        if self.state != self._drawn_state:
+            self._drawn_state = self.state
+            if self.state == GameState.VICTORY:
+                self.new_high_score = self.score > self.high_score
+                self.high_score = max(self.high_score, self.score)
+        if self.state == GameState.PLAYING:
+            return
             
-    def _draw_menu(self, surface):
-        """Draw menu screen"""
+        if self.state in OVERLAY_STATES:
+            surface.blit(self._overlay, (0, 0))
+        surface.blit(self._get_screen(), (0, 0))
+        for button in self._get_buttons().values():
+            if button.is_hovered:
+                button.draw(surface)
+                
+        if self.state == GameState.CALIBRATING:
+            time_left = self.calibration_time_left
+            if time_left > 0:
+                time_text = render_text(f"Time left: {time_left:.1f}s", TEXT_FONT_SIZE, WHITE)
+                time_rect = time_text.get_rect(center=(self.screen_width//2, 300))
+                surface.blit(time_text, time_rect)
+                
+    def _blit_text(self, surface, text, center):
+        surface.blit(text, text.get_rect(center=center))
+        
+    def _compose_menu(self, surface):
+        """Compose menu screen"""
         surface.fill(BLACK)
-        font = pygame.font.Font(None, 74)
-        title = font.render("Scream Game", True, WHITE)
-        title_rect = title.get_rect(center=(self.screen_width//2, 100))
-        surface.blit(title, title_rect)
+        title = render_text("Scream Game", TITLE_FONT_SIZE, WHITE)
+        self._blit_text(surface, title, (self.screen_width//2, 100))
         
-        for button in self.menu_buttons.values():
-            button.draw(surface)
-            
-    def _draw_pause(self, surface):
-        """Draw pause screen"""
-        s = pygame.Surface((self.screen_width, self.screen_height))
-        s.set_alpha(128)
-        s.fill(BLACK)
-        surface.blit(s, (0,0))
-        
-        font = pygame.font.Font(None, 74)
-        text = font.render("PAUSED", True, WHITE)
-        text_rect = text.get_rect(center=(self.screen_width//2, 100))
-        surface.blit(text, text_rect)
-        
-        for button in self.pause_buttons.values():
-            button.draw(surface)
-            
-    def _draw_game_over(self, surface):
-        """Draw game over screen"""
-        s = pygame.Surface((self.screen_width, self.screen_height))
-        s.set_alpha(128)
-        s.fill(BLACK)
-        surface.blit(s, (0,0))
-        
-        font = pygame.font.Font(None, 74)
-        text = font.render("GAME OVER", True, WHITE)
-        text_rect = text.get_rect(center=(self.screen_width//2, 100))
-        surface.blit(text, text_rect)
-        
-        score_font = pygame.font.Font(None, 48)
-        score_text = score_font.render(f"Score: {self.score}", True, WHITE)
-        score_rect = score_text.get_rect(center=(self.screen_width//2, 200))
-        surface.blit(score_text, score_rect)
-        
-        for button in self.game_over_buttons.values():
-            button.draw(surface)
-            
-    def _draw_calibration(self, surface):
-        """Draw calibration screen"""
+    def _compose_pause(self, surface):
+        """Compose pause screen"""
+        text = render_text("PAUSED", TITLE_FONT_SIZE, WHITE)
+        self._blit_text(surface, text, (self.screen_width//2, 100))
+        
+    def _compose_game_over(self, surface):
+        """Compose game over screen"""
+        text = render_text("GAME OVER", TITLE_FONT_SIZE, WHITE)
+        self._blit_text(surface, text, (self.screen_width//2, 100))
+        
+        score_text = render_text(f"Score: {self.score}", TEXT_FONT_SIZE, WHITE)
+        self._blit_text(surface, score_text, (self.screen_width//2, 200))
+        
+    def _compose_calibration(self, surface):
+        """Compose calibration screen; the countdown is drawn every frame"""
         surface.fill(BLACK)
         
-        font = pygame.font.Font(None, 48)
-        text = font.render("Calibrating Microphone...", True, WHITE)
-        text_rect = text.get_rect(center=(self.screen_width//2, 200))
-        surface.blit(text, text_rect)
+        text = render_text("Calibrating Microphone...", TEXT_FONT_SIZE, WHITE)
+        self._blit_text(surface, text, (self.screen_width//2, 200))
         
-        time_left = self.calibration_time - (pygame.time.get_ticks() - self.calibration_start) / 1000
-        if time_left > 0:
-            time_text = font.render(f"Time left: {time_left:.1f}s", True, WHITE)
-            time_rect = time_text.get_rect(center=(self.screen_width//2, 300))
-            surface.blit(time_text, time_rect)
-            
-    def _draw_level_complete(self, surface):
-        """Draw level complete screen"""
-        s = pygame.Surface((self.screen_width, self.screen_height))
-        s.set_alpha(128)
-        s.fill(BLACK)
-        surface.blit(s, (0,0))
-        
-        font = pygame.font.Font(None, 74)
-        text = font.render("Level Complete!", True, WHITE)
-        text_rect = text.get_rect(center=(self.screen_width//2, self.screen_height//2))
-        surface.blit(text, text_rect)
-        
-    def _draw_victory(self, surface):
-        """Draw victory screen"""
+    def _compose_level_complete(self, surface):
+        """Compose level complete screen"""
+        text = render_text("Level Complete!", TITLE_FONT_SIZE, WHITE)
+        self._blit_text(surface, text, (self.screen_width//2, self.screen_height//2))
+        
+    def _compose_victory(self, surface):
+        """Compose victory screen"""
         surface.fill(BLACK)
         
-        font = pygame.font.Font(None, 74)
-        text = font.render("Victory!", True, WHITE)
-        text_rect = text.get_rect(center=(self.screen_width//2, 200))
-        surface.blit(text, text_rect)
-        
-        score_font = pygame.font.Font(None, 48)
-        score_text = score_font.render(f"Final Score: {self.score}", True, WHITE)
-        score_rect = score_text.get_rect(center=(self.screen_width//2, 300))
-        surface.blit(score_text, score_rect)
-        
-        if self.score > self.high_score:
-            self.high_score = self.score
-            high_score_text = score_font.render("New High Score!", True, (255, 215, 0))
-            high_score_rect = high_score_text.get_rect(center=(self.screen_width//2, 400))
-            surface.blit(high_score_text, high_score_rect) 
\ No newline at end of file
+        text = render_text("Victory!", TITLE_FONT_SIZE, WHITE)
+        self._blit_text(surface, text, (self.screen_width//2, 200))
+        
+        score_text = render_text(f"Final Score: {self.score}", TEXT_FONT_SIZE, WHITE)
+        self._blit_text(surface, score_text, (self.screen_width//2, 300))
+        
+        if self.new_high_score:
+            high_score_text = render_text("New High Score!", TEXT_FONT_SIZE, (255, 215, 0))
+            self._blit_text(surface, high_score_text, (self.screen_width//2, 400))
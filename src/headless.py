@@ -0,0 +1,118 @@
+"""Run the game simulation without a window, audio device or frame limiter.
+
+Actions come from a script with one action per line, optionally followed by
+how many ticks to hold it (blank lines and ``#`` comments are ignored):
+
+    walk 120
+    jump
+    none 30
+
+Run with
+
+    python -m src.headless script.txt --max-ticks 100000
+"""
+
+import argparse
+import json
+import os
+import time
+
+import pygame
+
+from src import simulation
+from src.action_classifier import ACTIONS
+
+
+def init_headless_display():
+    """Initialise pygame on the dummy video driver.
+
+    Sprites are loaded with ``convert_alpha``, which needs a display mode, so
+    a 1x1 dummy one is set; nothing is ever shown.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.display.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+
+
+def parse_script(lines):
+    """Turn script lines into a list of ``(action, ticks)`` pairs"""
+    steps = []
+    for number, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        action = parts[0]
+        if action not in ACTIONS or len(parts) > 2:
+            raise ValueError(f"line {number}: expected '<action> [ticks]' with action in {ACTIONS}, got {line!r}")
+        ticks = int(parts[1]) if len(parts) == 2 else 1
+        steps.append((action, ticks))
+    return steps
+
+
+def load_script(path):
+    with open(path) as f:
+        return parse_script(f)
+
+
+def iter_actions(steps):
+    for action, ticks in steps:
+        for _ in range(ticks):
+            yield action
+
+
+def run(actions, max_ticks=None, sim=None):
+    """Step a simulation through ``actions`` until victory, death or the end.
+
+    Level completion moves straight on to the next level. Returns a report
+    dict with the outcome, final state and simulation speed.
+    """
+    sim = sim or simulation.Simulation()
+    outcome = simulation.PLAYING
+    levels_completed = 0
+    start = time.perf_counter()
+    for action in actions:
+        if max_ticks is not None and sim.ticks >= max_ticks:
+            break
+        outcome = sim.step(action)
+        if outcome == simulation.LEVEL_COMPLETE:
+            levels_completed += 1
+        elif outcome in (simulation.VICTORY, simulation.GAME_OVER):
+            break
+    elapsed = time.perf_counter() - start
+
+    report = sim.get_state()
+    report["outcome"] = outcome if outcome in (simulation.VICTORY, simulation.GAME_OVER) else "incomplete"
+    report["levels_completed"] = levels_completed
+    report["elapsed"] = elapsed
+    report["ticks_per_second"] = sim.ticks / elapsed if elapsed > 0 else None
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scripted actions through the game simulation headlessly")
+    parser.add_argument("script", help="action script, one '<action> [ticks]' per line")
+    parser.add_argument("--max-ticks", type=int, default=None, help="stop after this many ticks")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    steps = load_script(args.script)
+    init_headless_display()
+    report = run(iter_actions(steps), args.max_ticks)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    player = report["player"]
+    print(f"Outcome: {report['outcome']} after {report['tick']} ticks")
+    print(f"Level: {report['level']} ({report['levels_completed']} completed)")
+    print(f"Player: x={player['x']} y={player['y']} velocity=({player['velocity_x']:.2f}, {player['velocity_y']:.2f}) "
+          f"on_ground={player['on_ground']}")
+    if report["ticks_per_second"]:
+        print(f"Speed: {report['ticks_per_second']:.0f} ticks/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import bisect
+import json
+import math
+
+import numpy as np
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with constant memory.
+
+    Buckets are spaced evenly in log time between ``min_latency`` and
+    ``max_latency`` (seconds); percentiles are reported as the upper edge of
+    the bucket they fall in, clamped to the observed min/max.
+    """
+
+    def __init__(self, min_latency=1e-4, max_latency=10.0, bins_per_decade=20):
+        decades = math.log10(max_latency / min_latency)
+        n_bins = int(math.ceil(decades * bins_per_decade))
+        self.edges = np.logspace(math.log10(min_latency), math.log10(max_latency), n_bins + 1).tolist()
+
+        # One extra bucket on each side for under- and overflow
+        self.counts = [0] * (n_bins + 2)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, latency):
+        self.counts[bisect.bisect_right(self.edges, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.min = min(self.min, latency)
+        self.max = max(self.max, latency)
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        target = p / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target and bucket_count:
+                upper = self.edges[index] if index < len(self.edges) else self.max
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+    def to_dict(self):
+        """Summary in milliseconds plus the raw non-empty buckets"""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000,
+            "min_ms": self.min * 1000,
+            "max_ms": self.max * 1000,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "buckets": [
+                {"upper_ms": self.edges[i] * 1000 if i < len(self.edges) else None,
+                 "count": bucket_count}
+                for i, bucket_count in enumerate(self.counts) if bucket_count
+            ]
+        }
+
+
+class LatencyTracker:
+    """End-to-end input latency: audio block -> action decision -> frame flip.
+
+    Timestamps are ``time.perf_counter()`` values. An action's timing is the
+    pair ``(block_time, decision_time)``: when its audio block arrived in the
+    callback and when ``get_action()`` turned it into an action.
+    """
+
+    def __init__(self):
+        self.audio_to_action = LatencyHistogram()
+        self.action_to_photon = LatencyHistogram()
+        self.audio_to_photon = LatencyHistogram()
+
+    def record_action(self, block_time, decision_time):
+        self.audio_to_action.record(decision_time - block_time)
+
+    def record_frame(self, action_timing, flip_time):
+        """Record a flipped frame that shows the result of ``action_timing``"""
+        block_time, decision_time = action_timing
+        self.action_to_photon.record(flip_time - decision_time)
+        self.audio_to_photon.record(flip_time - block_time)
+
+    def report(self):
+        return {
+            "audio_to_action": self.audio_to_action.to_dict(),
+            "action_to_photon": self.action_to_photon.to_dict(),
+            "audio_to_photon": self.audio_to_photon.to_dict()
+        }
+
+    def dump_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
@@ -1,26 +1,46 @@
+import math
 import pygame
 import json
 from config.settings import *
+from src.platform_store import PlatformStore
+from src.spatial_hash import SpatialHash
+
+# Platform types that kill the player on contact
+HAZARD_TYPES = ("spike",)
+
+# Fill color per platform type, shared by every platform
+PLATFORM_TYPE_COLORS = {
+    "normal": (100, 100, 100),
+    "bounce": (0, 255, 0),
+    "spike": (255, 0, 0),
+    "moving": (0, 255, 255)
+}
 
 class Platform:
+    # Levels can hold very many platforms, so no per-instance __dict__
+    __slots__ = ("rect", "type")
+    
     def __init__(self, x, y, width, height, platform_type="normal"):
         self.rect = pygame.Rect(x, y, width, height)
         self.type = platform_type
-        self.color = self._get_color()
         
-    def _get_color(self):
-        colors = {
-            "normal": (100, 100, 100),
-            "bounce": (0, 255, 0),
-            "spike": (255, 0, 0),
-            "moving": (0, 255, 255)
-        }
-        return colors.get(self.type, (100, 100, 100))
+    @property
+    def color(self):
+        return PLATFORM_TYPE_COLORS.get(self.type, PLATFORM_TYPE_COLORS["normal"])
         
     def draw(self, surface):
         pygame.draw.rect(surface, self.color, self.rect)
         
 class MovingPlatform(Platform):
+    """A platform that travels back and forth horizontally.
+
+    Its level simulates it in the PlatformStore; the object is a view whose
+    rect and motion state are synced from the store only when a level query
+    (colliders, drawing) returns it.
+    """
+    __slots__ = ("start_x", "start_y", "move_distance", "speed", "direction",
+                 "distance_moved", "previous_x")
+    
     def __init__(self, x, y, width, height, move_distance, speed):
         super().__init__(x, y, width, height, "moving")
         self.start_x = x
@@ -29,14 +49,15 @@ class MovingPlatform(Platform):
         self.speed = speed
         self.direction = 1
         self.distance_moved = 0
+        self.previous_x = x
         
-    def update(self):
-        if abs(self.distance_moved) >= self.move_distance:
-            self.direction *= -1
-            
-        movement = self.speed * self.direction
-        self.rect.x += movement
-        self.distance_moved += movement
+    def get_draw_rect(self, alpha=1.0):
+        """Where the platform is drawn, between the previous and current tick positions"""
+        x = round(self.previous_x + (self.rect.x - self.previous_x) * alpha)
+        return pygame.Rect(x, self.rect.y, self.rect.width, self.rect.height)
+        
+    def draw(self, surface, alpha=1.0):
+        pygame.draw.rect(surface, self.color, self.get_draw_rect(alpha))
 
 class Level:
     def __init__(self, level_data):
@@ -44,7 +65,27 @@ class Level:
         self.moving_platforms = []
         self.spawn_point = (100, 100)
         self.exit_point = None
+        self.exit_rect = None
         self.background = None
+        # Broadphase index of the static platforms for collision queries
+        self.collision_grid = SpatialHash(COLLISION_CELL_SIZE)
+        # Platforms that kill on contact
+        self.hazard_grid = SpatialHash(COLLISION_CELL_SIZE)
+        # Moving platforms as column store rows (row i is
+        # self.moving_platforms[i]), simulated there as arrays
+        self.store = PlatformStore()
+        # Moving platform rows by the whole stretch each one travels, so the
+        # grid never changes as they move
+        self.moving_grid = SpatialHash(COLLISION_CELL_SIZE)
+        # Lists refilled by the per-tick queries instead of allocating new ones
+        self._nearby = []
+        self._moving_candidates = []
+        self._moving = []
+        self._colliders = []
+        self._hazards = []
+        # Background and static platforms pre-rendered at the drawn size;
+        # built on the first draw and again after the static platforms change
+        self._static_layer = None
         self.load_level(level_data)
         
     def load_level(self, level_data):
@@ -52,6 +93,7 @@ class Level:
         # Set spawn and exit points
         self.spawn_point = tuple(level_data.get("spawn_point", (100, 100)))
         self.exit_point = tuple(level_data.get("exit_point", (700, 100)))
+        self.exit_rect = pygame.Rect(self.exit_point[0], self.exit_point[1], 30, 30)
         
         # Load platforms
         for platform_data in level_data.get("platforms", []):
@@ -64,7 +106,6 @@ class Level:
                     platform_data.get("move_distance", 100),
                     platform_data.get("speed", 2)
                 )
-                self.moving_platforms.append(platform)
             else:
                 platform = Platform(
                     platform_data["x"],
@@ -73,37 +114,115 @@ class Level:
                     platform_data["height"],
                     platform_data.get("type", "normal")
                 )
-                self.platforms.append(platform)
+            self.add_platform(platform)
+            
+    def add_platform(self, platform):
+        """Add a platform to the level and to its collision and hazard indexes"""
+        rect = platform.rect
+        if platform.type == "moving":
+            row = self.store.add(rect.x, rect.y, rect.width, rect.height, platform.type,
+                                 platform.speed, platform.move_distance)
+            self.moving_platforms.append(platform)
+            # Platforms turn once they are move_distance from the start, so
+            # they stay within that plus one step (and a fraction) of it
+            reach = math.ceil(abs(platform.speed) + platform.move_distance) + 1
+            self.moving_grid.insert(row, pygame.Rect(rect.x - reach, rect.y,
+                                                     rect.width + 2 * reach, rect.height))
+        else:
+            self.platforms.append(platform)
+            self.collision_grid.insert(platform, platform.rect)
+            self._static_layer = None
+        if platform.type in HAZARD_TYPES:
+            self.hazard_grid.insert(platform, platform.rect)
                 
     def update(self):
         """Update level elements"""
-        for platform in self.moving_platforms:
-            platform.update()
+        # Vectorized; MovingPlatform objects are synced when they are queried,
+        # so moving_platforms[i] is only current once a query has returned it
+        self.store.update()
+        
+    def _sync_row(self, row):
+        """Copy a moving platform's state from the store into its object"""
+        store = self.store
+        platform = self.moving_platforms[row]
+        platform.rect.x = store.get(row, "x")
+        platform.previous_x = store.get(row, "previous_x")
+        platform.direction = store.get(row, "direction")
+        platform.distance_moved = store.get(row, "distance_moved")
+        return platform
+        
+    def _query_moving(self, rect, out):
+        """Refill ``out`` with the moving platforms overlapping ``rect``, in row order"""
+        out.clear()
+        store = self.store
+        for row in self.moving_grid.query(rect, self._moving_candidates):
+            if store.overlaps(row, rect):
+                out.append(self._sync_row(row))
+        return out
+        
+    def get_colliders(self, rect):
+        """Rects of the platforms overlapping ``rect``, for the per-tick player update.
+
+        Static platforms first, then moving ones. The list is owned by the
+        level and refilled on every call.
+        """
+        colliders = self._colliders
+        colliders.clear()
+        for platform in self.collision_grid.query(rect, self._nearby):
+            colliders.append(platform.rect)
+        if self.moving_platforms:
+            for platform in self._query_moving(rect, self._moving):
+                colliders.append(platform.rect)
+        return colliders
+        
+    def touches_hazard(self, rect):
+        """Whether ``rect`` overlaps a hazard platform"""
+        return bool(self.hazard_grid.query(rect, self._hazards))
             
-    def draw(self, surface):
-        """Draw all level elements"""
-        # Draw background
-        surface.fill(BLACK)
+    def get_moving_draw_rects(self, area, alpha=1.0):
+        """Where the moving platforms inside ``area`` are drawn for ``alpha``"""
+        return [platform.get_draw_rect(alpha) for platform in self._query_moving(area, [])]
+            
+    def _get_static_layer(self, size):
+        if self._static_layer is None or self._static_layer.get_size() != size:
+            layer = pygame.Surface(size)
+            layer.fill(BLACK)
+            for platform in self.collision_grid.query(layer.get_rect()):
+                platform.draw(layer)
+            self._static_layer = layer
+        return self._static_layer
         
-        # Draw platforms
-        for platform in self.platforms + self.moving_platforms:
-            platform.draw(surface)
+    def draw(self, surface, alpha=1.0):
+        """Draw the level elements inside the surface's clip area, moving ones interpolated by ``alpha``"""
+        area = surface.get_clip()
+        # Background and static platforms in one blit
+        surface.blit(self._get_static_layer(surface.get_size()), area, area)
+        
+        for platform in self._query_moving(area, []):
+            platform.draw(surface, alpha)
             
         # Draw exit point
         if self.exit_point:
-            pygame.draw.rect(surface, GREEN, 
-                           pygame.Rect(self.exit_point[0], self.exit_point[1], 30, 30))
+            pygame.draw.rect(surface, GREEN, self.exit_rect)
 
 class LevelManager:
-    def __init__(self):
+    def __init__(self, level_data=None):
         self.levels = []
         self.current_level_index = 0
-        self.load_levels()
+        self.load_levels(level_data)
+        
+    def load_levels(self, level_data=None):
+        """Load a list of level dicts, or the built-in levels"""
+        if level_data is None:
+            level_data = self._builtin_level_data()
+        # Kept so a level can be rebuilt from scratch on reset
+        self.level_data = list(level_data)
+        self.levels = [Level(data) for data in self.level_data]
         
-    def load_levels(self):
-        """Load all level data"""
+    @staticmethod
+    def _builtin_level_data():
         # Example level data - in a real game, this would be loaded from files
-        level_data = [
+        return [
             {
                 "spawn_point": [100, 450],
                 "exit_point": [700, 450],
@@ -129,8 +248,6 @@ class LevelManager:
             }
         ]
         
-        self.levels = [Level(data) for data in level_data]
-        
     def get_current_level(self):
         """Get the current level"""
         return self.levels[self.current_level_index]
@@ -148,36 +265,4 @@ class LevelManager:
         
     def reset_level(self):
         """Reset the current level"""
-        self.levels[self.current_level_index] = Level(
-            self._get_level_data(self.current_level_index)
-        )
-        
-    def _get_level_data(self, index):
-        """Get the level data for the specified index"""
-        # In a real game, this would load from a file
-        level_data = [
-            {
-                "spawn_point": [100, 450],
-                "exit_point": [700, 450],
-                "platforms": [
-                    {"x": 0, "y": 500, "width": 800, "height": 100, "type": "normal"},
-                    {"x": 300, "y": 400, "width": 200, "height": 20, "type": "normal"},
-                    {"x": 100, "y": 300, "width": 200, "height": 20, "type": "normal"},
-                    {"x": 500, "y": 300, "width": 200, "height": 20, "type": "normal"},
-                    {"x": 300, "y": 200, "width": 200, "height": 20, "type": "moving",
-                     "move_distance": 200, "speed": 3}
-                ]
-            },
-            {
-                "spawn_point": [100, 450],
-                "exit_point": [700, 150],
-                "platforms": [
-                    {"x": 0, "y": 500, "width": 800, "height": 100, "type": "normal"},
-                    {"x": 200, "y": 400, "width": 100, "height": 20, "type": "bounce"},
-                    {"x": 400, "y": 300, "width": 100, "height": 20, "type": "normal"},
-                    {"x": 600, "y": 200, "width": 200, "height": 20, "type": "normal"},
-                    {"x": 300, "y": 350, "width": 50, "height": 10, "type": "spike"}
-                ]
-            }
-        ]
-        return level_data[index] 
\ No newline at end of file
+        self.levels[self.current_level_index] = Level(self.level_data[self.current_level_index])
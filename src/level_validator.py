@@ -0,0 +1,232 @@
+"""Check that each level's exit can be reached from its spawn point.
+
+The search runs the real game rules (``Simulation.step`` and so
+``Player.update``) breadth-first over the actions the sound processor can
+produce. Live input yields at most one action per cooldown, so every branch
+applies one action (possibly "none") and then lets ``DECISION_TICKS - 1``
+ticks pass with none. Live decisions don't land on a fixed tick grid;
+``jitter`` also tries each action one tick later, which finds more routes
+but searches far more states. States already seen (position, velocity, jump/double-jump/dash state
+and the positions of moving platforms within reach) are pruned, and levels
+are checked in parallel across a process pool.
+
+Speeds are compared at ``VELOCITY_RESOLUTION`` and actions are only tried
+every ``decision_ticks``, so a search that finds nothing means no route was
+found within those limits, not that none exists.
+
+    python -m src.level_validator                 # built-in levels
+    python -m src.level_validator levels.json     # a JSON list of level dicts
+"""
+
+import argparse
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from config.settings import TICK_RATE
+from src import simulation
+from src.action_classifier import ACTIONS
+from src.headless import init_headless_display
+from src.level_manager import LevelManager
+from src.player import MAX_STEP
+
+# Ticks between input decisions: SoundProcessor's 0.1 s action cooldown
+DECISION_TICKS = max(1, round(0.1 * TICK_RATE))
+DEFAULT_MAX_STATES = 50000
+# Horizontal speeds closer than this count as the same state
+VELOCITY_RESOLUTION = 0.25
+
+# Player attributes that affect future movement
+PLAYER_FIELDS = ("previous_x", "previous_y", "velocity_x", "velocity_y", "on_ground",
+                 "on_wall", "facing_right", "is_jumping", "is_double_jumping",
+                 "is_dashing", "is_crouching", "dash_ticks_left", "can_double_jump")
+# Moving-platform columns that change as the level updates
+LEVEL_COLUMNS = ("x", "previous_x", "direction", "distance_moved")
+
+
+class LevelSearch:
+    """Breadth-first reachability search over one level"""
+
+    def __init__(self, level_data, decision_ticks=DECISION_TICKS, jitter=False):
+        self.decision_ticks = decision_ticks
+        self.jitter = jitter
+        self.simulation = simulation.Simulation(LevelManager([level_data]))
+        self.player = self.simulation.player
+        self.store = self.simulation.level_manager.get_current_level().store
+        self.moving_rows = self.store.moving_rows
+
+    def _reach(self):
+        """Area the player could touch before the next decision"""
+        margin = 2 * self.decision_ticks * MAX_STEP
+        return self.player.rect.inflate(margin, margin)
+
+    def snapshot(self):
+        player = self.player
+        level_state = tuple(tuple(getattr(self.store, name)[self.moving_rows].tolist())
+                            for name in LEVEL_COLUMNS)
+        nearby = tuple(self.store.query_overlap(self._reach(), self.moving_rows).tolist())
+        return (player.rect.x, player.rect.y,
+                tuple(getattr(player, name) for name in PLAYER_FIELDS), level_state, nearby)
+
+    def restore(self, state):
+        x, y, fields, level_state, _ = state
+        player = self.player
+        player.rect.x = x
+        player.rect.y = y
+        for name, value in zip(PLAYER_FIELDS, fields):
+            setattr(player, name, value)
+        for name, values in zip(LEVEL_COLUMNS, level_state):
+            getattr(self.store, name)[self.moving_rows] = values
+
+    def key(self, state):
+        """Visited-set key: the snapshot with speed quantised and redundant fields dropped.
+
+        Only moving platforms within reach are part of the key, so the player
+        can wait next to a platform for it to come round, but waiting far
+        away from every platform is pruned.
+        """
+        x, y, fields, level_state, nearby = state
+        values = dict(zip(PLAYER_FIELDS, fields))
+        positions = [self.moving_rows.tolist().index(row) for row in nearby]
+        return (x, y, round(values["velocity_x"] / VELOCITY_RESOLUTION), values["velocity_y"],
+                values["on_ground"], values["facing_right"], values["is_double_jumping"],
+                values["can_double_jump"], values["is_dashing"], values["dash_ticks_left"],
+                values["is_crouching"], nearby,
+                tuple((level_state[0][i], level_state[2][i]) for i in positions))
+
+    def branches(self):
+        """(action, ticks until the next decision) pairs tried from every state"""
+        branches = [(action, self.decision_ticks) for action in ACTIONS]
+        if self.jitter:
+            branches += [(action, self.decision_ticks + 1) for action in ACTIONS if action != "none"]
+        return branches
+
+    def advance(self, action, ticks):
+        """Apply ``action`` then idle until the next decision; return the outcome"""
+        outcome = self.simulation.step(action)
+        for _ in range(ticks - 1):
+            if outcome != simulation.PLAYING:
+                break
+            outcome = self.simulation.step("none")
+        return outcome
+
+    def search(self, max_states=DEFAULT_MAX_STATES):
+        """Return a result dict; ``script`` holds a winning sequence of branches if one was found"""
+        start = self.snapshot()
+        visited = {self.key(start)}
+        parents = [(None, None)]  # (parent index, action) per expanded state
+        queue = deque([(start, 0)])
+        branches = self.branches()
+        while queue:
+            state, index = queue.popleft()
+            for branch in branches:
+                self.restore(state)
+                outcome = self.advance(*branch)
+                if outcome == simulation.VICTORY:
+                    return self._result(True, len(visited), self._path(parents, index) + [branch])
+                if outcome == simulation.GAME_OVER:
+                    continue
+                child = self.snapshot()
+                key = self.key(child)
+                if key in visited:
+                    continue
+                visited.add(key)
+                if len(visited) > max_states:
+                    return self._result(False, len(visited), None, stopped=True)
+                parents.append((index, branch))
+                queue.append((child, len(parents) - 1))
+        return self._result(False, len(visited), None)
+
+    @staticmethod
+    def _path(parents, index):
+        branches = []
+        while parents[index][0] is not None:
+            index, branch = parents[index]
+            branches.append(branch)
+        return branches[::-1]
+
+    def _result(self, reachable, states, path, stopped=False):
+        return {
+            "reachable": reachable,
+            "states": states,
+            # Every state within the search limits was tried without reaching
+            # the exit; the pruning makes this no proof that the exit is unreachable
+            "no_route_found": not reachable and not stopped,
+            # (action, ticks) steps that reach the exit, as a headless action script
+            "script": path,
+            "ticks": sum(ticks for _, ticks in path) if path else None
+        }
+
+
+def _merge_steps(script):
+    """Write each branch as the action plus its idle ticks, merging idle runs"""
+    steps = []
+    for action, ticks in script:
+        steps.append((action, 1))
+        if ticks > 1:
+            steps.append(("none", ticks - 1))
+    merged = []
+    for action, ticks in steps:
+        if merged and merged[-1][0] == action == "none":
+            merged[-1] = (action, merged[-1][1] + ticks)
+        else:
+            merged.append((action, ticks))
+    return merged
+
+
+def _init_worker():
+    # Player sprites need a (dummy) display in every worker
+    init_headless_display()
+
+
+def validate_level(level_data, max_states=DEFAULT_MAX_STATES, decision_ticks=DECISION_TICKS, jitter=False):
+    return LevelSearch(level_data, decision_ticks, jitter).search(max_states)
+
+
+def validate_levels(levels, max_states=DEFAULT_MAX_STATES, decision_ticks=DECISION_TICKS,
+                    jitter=False, workers=None):
+    """Validate every level dict across a process pool; results in level order"""
+    workers = min(workers or os.cpu_count() or 1, len(levels)) or 1
+    count = len(levels)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(validate_level, levels, [max_states] * count,
+                             [decision_ticks] * count, [jitter] * count))
+
+
+def builtin_levels():
+    return LevelManager().level_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that every level's exit is reachable")
+    parser.add_argument("levels", nargs="?", help="JSON file with a list of level dicts (default: built-in levels)")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: all cores)")
+    parser.add_argument("--max-states", type=int, default=DEFAULT_MAX_STATES, help="search limit per level")
+    parser.add_argument("--decision-ticks", type=int, default=DECISION_TICKS, help="ticks between actions")
+    parser.add_argument("--jitter", action="store_true", help="also try each action a tick late (slower)")
+    args = parser.parse_args()
+
+    if args.levels:
+        with open(args.levels) as f:
+            levels = json.load(f)
+    else:
+        levels = builtin_levels()
+
+    results = validate_levels(levels, args.max_states, args.decision_ticks, args.jitter, args.workers)
+    failed = False
+    for index, result in enumerate(results):
+        if result["reachable"]:
+            print(f"Level {index}: reachable in {result['ticks']} ticks ({result['states']} states searched)")
+            print("  " + ", ".join(f"{action} {ticks}" for action, ticks in _merge_steps(result["script"])))
+        elif result["no_route_found"]:
+            failed = True
+            print(f"Level {index}: no route found within the search limits ({result['states']} states searched)")
+        else:
+            failed = True
+            print(f"Level {index}: undecided, search stopped at {result['states']} states")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
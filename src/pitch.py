@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+from scipy.fft import irfft, next_fast_len, rfft
+
+
+class PitchEstimator:
+    """YIN fundamental-frequency estimator with a fixed per-block cost.
+
+    Only the newest ``frame_size`` samples are analysed, where the frame is
+    just long enough for the lowest frequency of interest, so the cost does
+    not grow with the analysis window. The difference function is computed
+    for all lags at once through one FFT autocorrelation.
+    """
+
+    def __init__(self, sample_rate, min_freq=80, max_freq=4000, threshold=0.15):
+        self.sample_rate = sample_rate
+        self.min_freq = min_freq
+        self.max_freq = max_freq
+        self.threshold = threshold
+
+        self.min_lag = max(2, int(sample_rate / max_freq))
+        self.max_lag = int(math.ceil(sample_rate / min_freq))
+        # Integration window of one max_lag period, so the frame is 2 * max_lag
+        self.integration_size = self.max_lag
+        self.frame_size = self.integration_size + self.max_lag
+        self.fft_size = next_fast_len(self.frame_size + self.integration_size, real=True)
+
+        self._lags = np.arange(self.max_lag + 1)
+        self._frame = np.empty(self.frame_size)
+        self._squares = np.empty(self.frame_size + 1)
+
+    def estimate(self, samples):
+        """Return ``(frequency, confidence)`` for the newest samples.
+
+        Confidence is ``1 - d'(tau)`` of the chosen lag and is 0 for silence
+        or frames too short to analyse.
+        """
+        if len(samples) < self.frame_size:
+            return 0.0, 0.0
+        frame = self._frame
+        frame[:] = samples[-self.frame_size:]
+        frame -= frame.mean()
+
+        w = self.integration_size
+        squares = self._squares
+        squares[0] = 0.0
+        np.cumsum(frame * frame, out=squares[1:])
+        if squares[w] <= 1e-12:
+            return 0.0, 0.0
+
+        # d(tau) = sum (x_j - x_{j+tau})^2 = E(0) + E(tau) - 2 r(tau)
+        spectrum = rfft(frame, self.fft_size)
+        spectrum *= np.conj(rfft(frame[:w], self.fft_size))
+        correlation = irfft(spectrum, self.fft_size)[:self.max_lag + 1]
+        lags = self._lags
+        energy = squares[lags + w] - squares[lags]
+        difference = squares[w] + energy - 2 * correlation
+        np.maximum(difference, 0, out=difference)
+
+        # Cumulative mean normalised difference d'(tau)
+        cumulative = np.cumsum(difference[1:])
+        normalised = np.ones_like(difference)
+        np.divide(difference[1:] * lags[1:], cumulative, out=normalised[1:], where=cumulative > 0)
+
+        candidates = normalised[self.min_lag:]
+        below = np.flatnonzero(candidates < self.threshold)
+        if len(below):
+            # First dip under the threshold, followed down to its local minimum
+            start = below[0]
+            rising = np.flatnonzero(np.diff(candidates[start:]) >= 0)
+            tau = start + (rising[0] if len(rising) else len(candidates) - 1 - start)
+        else:
+            tau = int(np.argmin(candidates))
+        tau += self.min_lag
+
+        confidence = float(np.clip(1.0 - normalised[tau], 0.0, 1.0))
+        return float(self.sample_rate / self._refine(normalised, tau)), confidence
+
+    def _refine(self, values, tau):
+        """Parabolic interpolation of the minimum around ``tau``"""
+        if tau <= 0 or tau >= len(values) - 1:
+            return float(tau)
+        left, centre, right = values[tau - 1], values[tau], values[tau + 1]
+        denominator = left - 2 * centre + right
+        if denominator <= 0:
+            return float(tau)
+        return tau + 0.5 * (left - right) / denominator
@@ -0,0 +1,152 @@
+import numpy as np
+import pygame
+
+PLATFORM_TYPES = ("normal", "bounce", "spike", "moving")
+TYPE_CODES = {name: code for code, name in enumerate(PLATFORM_TYPES)}
+MOVING = TYPE_CODES["moving"]
+
+
+class PlatformStore:
+    """Struct-of-arrays platform storage.
+
+    One NumPy column per attribute (position, size, type and the moving
+    platform state), so moving every platform and testing every platform
+    against a rect are single vectorized operations. Rows are appended with
+    ``add`` and keep their index for the store's lifetime.
+    """
+
+    COLUMNS = {
+        "x": np.float64,
+        "y": np.float64,
+        "w": np.float64,
+        "h": np.float64,
+        "type": np.int8,
+        "speed": np.float64,
+        "direction": np.float64,
+        "distance_moved": np.float64,
+        "move_distance": np.float64,
+        "previous_x": np.float64
+    }
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self._capacity = max(1, capacity)
+        self._columns = {name: np.zeros(self._capacity, dtype=dtype)
+                         for name, dtype in self.COLUMNS.items()}
+        self._moving_rows = None
+
+    def __len__(self):
+        return self.count
+
+    def __getattr__(self, name):
+        # Column views trimmed to the rows in use, e.g. store.x
+        columns = self.__dict__.get("_columns")
+        if columns is not None and name in columns:
+            return columns[name][:self.count]
+        raise AttributeError(name)
+
+    def add(self, x, y, width, height, platform_type="normal", speed=0, move_distance=0):
+        """Append a platform and return its row index"""
+        if self.count == self._capacity:
+            self._grow()
+        row = self.count
+        columns = self._columns
+        columns["x"][row] = x
+        columns["y"][row] = y
+        columns["w"][row] = width
+        columns["h"][row] = height
+        columns["type"][row] = TYPE_CODES.get(platform_type, TYPE_CODES["normal"])
+        columns["speed"][row] = speed
+        columns["direction"][row] = 1
+        columns["distance_moved"][row] = 0
+        columns["move_distance"][row] = move_distance
+        columns["previous_x"][row] = x
+        self.count += 1
+        self._moving_rows = None
+        return row
+
+    def _grow(self):
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.zeros(self._capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self._columns[name] = grown
+
+    @property
+    def moving_rows(self):
+        """Indices of the moving platforms"""
+        if self._moving_rows is None:
+            rows = np.flatnonzero(self.type == MOVING)
+            count = len(rows)
+            # Per-moving-platform scratch arrays, so ticks don't allocate
+            self._x = np.zeros(count)
+            self._direction = np.zeros(count)
+            self._distance = np.zeros(count)
+            self._movement = np.zeros(count)
+            self._turning = np.zeros(count, dtype=bool)
+            self._speed = self.speed[rows]
+            self._limit = self.move_distance[rows]
+            self._moving_rows = rows
+        return self._moving_rows
+
+    def update(self):
+        """Advance every moving platform by one tick.
+
+        A platform turns once it is ``move_distance`` from its start, then
+        moves ``speed`` in its direction. Positions accumulate as exact
+        floats; only the rects synced from them are rounded to pixels.
+        """
+        rows = self.moving_rows
+        if not len(rows):
+            return
+        columns = self._columns
+        x, direction, distance, movement = self._x, self._direction, self._distance, self._movement
+
+        # Gather into the scratch arrays, step, scatter back
+        np.take(columns["x"], rows, out=x, mode="clip")
+        columns["previous_x"][rows] = x
+        np.take(columns["distance_moved"], rows, out=distance, mode="clip")
+        np.abs(distance, out=movement)
+        np.greater_equal(movement, self._limit, out=self._turning)
+        np.take(columns["direction"], rows, out=direction, mode="clip")
+        np.negative(direction, out=direction, where=self._turning)
+        columns["direction"][rows] = direction
+        np.multiply(self._speed, direction, out=movement)
+        np.add(x, movement, out=x)
+        columns["x"][rows] = x
+        np.add(distance, movement, out=distance)
+        columns["distance_moved"][rows] = distance
+
+    def get(self, row, name):
+        """One value as a Python number"""
+        return self._columns[name].item(row)
+
+    def overlaps(self, row, rect):
+        """Whether the platform in ``row`` overlaps ``rect`` (the query_overlap test)"""
+        columns = self._columns
+        x = columns["x"].item(row)
+        y = columns["y"].item(row)
+        w = columns["w"].item(row)
+        h = columns["h"].item(row)
+        return (x < rect.right and x + w > rect.left and y < rect.bottom and y + h > rect.top
+                and w > 0 and h > 0)
+
+    def query_overlap(self, rect, rows=None, platform_type=None):
+        """Row indices whose platforms overlap ``rect`` (pygame.Rect semantics).
+
+        ``rows`` restricts the test to a subset of rows and ``platform_type``
+        to one type of platform.
+        """
+        x, y, w, h = self.x, self.y, self.w, self.h
+        if rows is not None:
+            x, y, w, h = x[rows], y[rows], w[rows], h[rows]
+        mask = ((x < rect.right) & (x + w > rect.left) &
+                (y < rect.bottom) & (y + h > rect.top) & (w > 0) & (h > 0))
+        if platform_type is not None:
+            types = self.type if rows is None else self.type[rows]
+            mask &= types == TYPE_CODES[platform_type]
+        hits = np.flatnonzero(mask)
+        return hits if rows is None else rows[hits]
+
+    def rect(self, row):
+        return pygame.Rect(int(self.x[row]), int(self.y[row]), int(self.w[row]), int(self.h[row]))
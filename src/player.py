@@ -1,9 +1,28 @@
 import pygame
 import time
 from config.settings import *
+from src.collision import first_hit
 from src.sprite_manager import SpriteManager, PlayerState
 
+# Furthest the player can move along either axis in one update
+MAX_STEP = max(WALK_SPEED, DASH_SPEED, JUMP_STRENGTH, MAX_FALL_SPEED)
+
+# Scratch rect for converting velocities to whole-pixel steps
+_probe = pygame.Rect(0, 0, 0, 0)
+
+
+def _pixel_step(position, velocity):
+    """Whole pixels a rect coordinate moves when ``velocity`` is added to it"""
+    _probe.x = position
+    _probe.x += velocity
+    return _probe.x - position
+
 class Player:
+    __slots__ = ("sprite_manager", "width", "height", "rect", "_collision_bounds",
+                 "previous_x", "previous_y", "velocity_x", "velocity_y", "on_ground",
+                 "on_wall", "facing_right", "is_jumping", "is_double_jumping", "is_dashing",
+                 "is_crouching", "dash_ticks_left", "can_double_jump", "pending_action_timing")
+    
     def __init__(self, x, y):
         self.sprite_manager = SpriteManager()
         self.sprite_manager.load_sprite_sheets()
@@ -15,6 +34,11 @@ class Player:
         
         # Create rect with sprite dimensions
         self.rect = pygame.Rect(x, y, self.width, self.height)
+        self._collision_bounds = self.rect.copy()
+        
+        # Position at the start of the last tick, for interpolated drawing
+        self.previous_x = x
+        self.previous_y = y
         
         # Movement variables
         self.velocity_x = 0
@@ -28,25 +52,35 @@ class Player:
         self.is_double_jumping = False
         self.is_dashing = False
         self.is_crouching = False
-        self.dash_start_time = 0
+        self.dash_ticks_left = 0
         self.can_double_jump = True
         
-    def update(self, action, platforms):
-        current_time = time.time()
+        # Latency timing of the last action, until a frame showing it is flipped
+        self.pending_action_timing = None
+        
+    def update(self, action, platforms, action_timing=None):
+        """Advance the player by one fixed simulation tick"""
+        current_time = time.time()  # only drives the sprite animation
+        self.previous_x = self.rect.x
+        self.previous_y = self.rect.y
         
         # Handle dash
         if self.is_dashing:
-            if current_time - self.dash_start_time > DASH_DURATION:
+            if self.dash_ticks_left <= 0:
                 self.is_dashing = False
             else:
+                self.dash_ticks_left -= 1
                 self.velocity_x = DASH_SPEED if self.facing_right else -DASH_SPEED
                 self.velocity_y = 0
+                self._move_horizontal(platforms)
                 self.sprite_manager.set_state(PlayerState.DASHING)
                 return
         
         # Process sound-based actions
         if action != "none":
             self._handle_action(action)
+            if action_timing is not None:
+                self.pending_action_timing = action_timing
         
         # Apply gravity if not on ground
         if not self.on_ground:
@@ -59,11 +93,8 @@ class Player:
             self.velocity_x *= AIR_RESISTANCE
             
         # Update position
-        self.rect.x += self.velocity_x
-        self._handle_horizontal_collisions(platforms)
-        
-        self.rect.y += self.velocity_y
-        self._handle_vertical_collisions(platforms)
+        self._move_horizontal(platforms)
+        self._move_vertical(platforms)
         
         # Update sprite state
         self._update_sprite_state()
@@ -86,7 +117,7 @@ class Player:
                 
         elif action == "dash" and not self.is_dashing:
             self.is_dashing = True
-            self.dash_start_time = time.time()
+            self.dash_ticks_left = DASH_TICKS
             
         elif action == "crouch" and self.on_ground:
             self.is_crouching = True
@@ -94,6 +125,45 @@ class Player:
         else:
             self.is_crouching = False
             
+    def _move_horizontal(self, platforms):
+        """Move by velocity_x, stopping at the first platform swept into"""
+        dx = _pixel_step(self.rect.x, self.velocity_x)
+        _, hit = first_hit(self.rect, dx, 0, platforms)
+        if hit is None:
+            self.rect.x += dx
+            # Still catch overlaps that already existed (e.g. a platform moved into us)
+            self._handle_horizontal_collisions(platforms)
+            return
+            
+        if dx > 0:
+            self.rect.right = hit.left
+        else:
+            self.rect.left = hit.right
+        self.on_wall = True
+        self.velocity_x = 0
+        
+    def _move_vertical(self, platforms):
+        """Move by velocity_y, landing on or bumping the first platform swept into"""
+        dy = _pixel_step(self.rect.y, self.velocity_y)
+        _, hit = first_hit(self.rect, 0, dy, platforms)
+        if hit is None:
+            self.rect.y += dy
+            self._handle_vertical_collisions(platforms)
+            return
+            
+        self.on_ground = False
+        if dy > 0:
+            self.rect.bottom = hit.top
+            self._land()
+        else:
+            self.rect.top = hit.bottom
+        self.velocity_y = 0
+        
+    def _land(self):
+        self.on_ground = True
+        self.is_jumping = False
+        self.is_double_jumping = False
+            
     def _handle_horizontal_collisions(self, platforms):
         """Handle collisions with platforms horizontally"""
         for platform in platforms:
@@ -115,9 +185,7 @@ class Player:
             if self.rect.colliderect(platform):
                 if self.velocity_y > 0:  # Moving down
                     self.rect.bottom = platform.top
-                    self.on_ground = True
-                    self.is_jumping = False
-                    self.is_double_jumping = False
+                    self._land()
                 elif self.velocity_y < 0:  # Moving up
                     self.rect.top = platform.bottom
                 self.velocity_y = 0
@@ -142,25 +210,62 @@ class Player:
             self.facing_right = self.velocity_x > 0
             self.sprite_manager.set_direction(self.facing_right)
             
-    def draw(self, surface):
-        """Draw the player on the surface"""
+    def draw(self, surface, alpha=1.0):
+        """Draw the player on the surface.
+
+        ``alpha`` is how far rendering is between the previous tick and the
+        current one, so motion stays smooth at any frame rate.
+        """
         sprite = self.sprite_manager.get_current_frame()
+        x, y = self._draw_position(alpha)
         # Center the sprite on the collision rect
-        draw_x = self.rect.x - (sprite.get_width() - self.rect.width) // 2
-        draw_y = self.rect.y - (sprite.get_height() - self.rect.height) // 2
+        draw_x = x - (sprite.get_width() - self.rect.width) // 2
+        draw_y = y - (sprite.get_height() - self.rect.height) // 2
         surface.blit(sprite, (draw_x, draw_y))
         
         if SHOW_HITBOXES:
-            pygame.draw.rect(surface, RED, self.rect, 2)
+            pygame.draw.rect(surface, RED, (x, y, self.rect.width, self.rect.height), 2)
+            
+    def _draw_position(self, alpha):
+        return (round(self.previous_x + (self.rect.x - self.previous_x) * alpha),
+                round(self.previous_y + (self.rect.y - self.previous_y) * alpha))
+                
+    def get_draw_rect(self, alpha=1.0):
+        """Area ``draw`` covers for the same ``alpha`` (sprite and hitbox)"""
+        x, y = self._draw_position(alpha)
+        width, height = self.sprite_manager.get_frame_size()
+        rect = pygame.Rect(x - (width - self.rect.width) // 2,
+                           y - (height - self.rect.height) // 2, width, height)
+        rect.union_ip((x, y, self.rect.width, self.rect.height))
+        return rect
+            
+    def get_collision_bounds(self):
+        """Area the next update can touch, for broadphase platform queries.
+
+        The same Rect is updated in place and returned on every call.
+        """
+        bounds = self._collision_bounds
+        bounds.update(self.rect)
+        bounds.inflate_ip(2 * MAX_STEP, 2 * MAX_STEP)
+        return bounds
+            
+    def pop_action_timing(self):
+        """Return and clear the timing of the last action not yet on screen"""
+        timing = self.pending_action_timing
+        self.pending_action_timing = None
+        return timing
             
     def reset(self, x, y):
         """Reset player position and state"""
         self.rect.x = x
         self.rect.y = y
+        self.previous_x = x
+        self.previous_y = y
         self.velocity_x = 0
         self.velocity_y = 0
         self.is_jumping = False
         self.is_double_jumping = False
         self.is_dashing = False
+        self.dash_ticks_left = 0
         self.is_crouching = False
         self.can_double_jump = True 
\ No newline at end of file
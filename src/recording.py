@@ -0,0 +1,251 @@
+"""Compact session recordings and deterministic replay.
+
+A recording holds one code per simulation tick: the action the player got,
+or ``PAUSED`` for ticks where only the platforms moved. Consecutive equal
+codes are run-length encoded as one varint ``(run_length << 3) | code``, so
+minutes of play usually take a few hundred bytes. Optionally each tick also
+stores the sound intensity and dominant frequency, delta- and
+zigzag-encoded as varints.
+
+Replay a recording with
+
+    python -m src.recording session.scrm
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from config.settings import TICK_RATE
+from src import simulation
+from src.action_classifier import ACTIONS
+
+MAGIC = b"SCRM"
+VERSION = 1
+FLAG_FEATURES = 1
+
+PAUSED = len(ACTIONS)  # tick code for a paused tick
+_CODE_BITS = 3
+_CODE_MASK = (1 << _CODE_BITS) - 1
+_ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+_INTENSITY_SCALE = 65535  # intensity is stored as a 16-bit fraction of full scale
+
+
+def write_varint(out, value):
+    """Append an unsigned LEB128 varint to the bytearray ``out``"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    """Decode the varint at ``offset``; return ``(value, next_offset)``"""
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Truncated recording")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+
+def _unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+
+def _write_deltas(out, values):
+    previous = 0
+    for value in values:
+        write_varint(out, _zigzag(value - previous))
+        previous = value
+
+
+def _read_deltas(data, offset, count):
+    values = np.empty(count, dtype=np.int64)
+    previous = 0
+    for i in range(count):
+        delta, offset = read_varint(data, offset)
+        previous += _unzigzag(delta)
+        values[i] = previous
+    return values, offset
+
+
+class SessionRecorder:
+    """Collects the per-tick action stream of a session"""
+
+    def __init__(self, start_level=0, record_features=False):
+        self.start_level = start_level
+        self.record_features = record_features
+        self.codes = []
+        self.intensities = []
+        self.frequencies = []
+
+    def __len__(self):
+        return len(self.codes)
+
+    def record(self, action, intensity=0.0, frequency=0.0):
+        """Record a playing tick with the action the player received"""
+        self._append(_ACTION_CODES[action], intensity, frequency)
+
+    def record_pause(self, intensity=0.0, frequency=0.0):
+        """Record a tick where the game was paused"""
+        self._append(PAUSED, intensity, frequency)
+
+    def _append(self, code, intensity, frequency):
+        self.codes.append(code)
+        if self.record_features:
+            self.intensities.append(round(min(max(intensity, 0.0), 1.0) * _INTENSITY_SCALE))
+            self.frequencies.append(round(frequency))
+
+    def to_bytes(self):
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        out.append(FLAG_FEATURES if self.record_features else 0)
+        write_varint(out, self.start_level)
+        write_varint(out, len(self.codes))
+
+        runs = bytearray()
+        run_count = 0
+        i = 0
+        while i < len(self.codes):
+            code = self.codes[i]
+            start = i
+            while i < len(self.codes) and self.codes[i] == code:
+                i += 1
+            write_varint(runs, ((i - start) << _CODE_BITS) | code)
+            run_count += 1
+        write_varint(out, run_count)
+        out += runs
+
+        if self.record_features:
+            _write_deltas(out, self.intensities)
+            _write_deltas(out, self.frequencies)
+        return bytes(out)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+class SessionRecording:
+    """A decoded recording: tick codes and, optionally, sound features"""
+
+    def __init__(self, codes, start_level=0, intensities=None, frequencies=None):
+        self.codes = codes
+        self.start_level = start_level
+        self.intensities = intensities
+        self.frequencies = frequencies
+
+    def __len__(self):
+        return len(self.codes)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a session recording")
+        offset = len(MAGIC)
+        if len(data) < offset + 2:
+            raise ValueError("Truncated recording")
+        version, flags = data[offset], data[offset + 1]
+        if version != VERSION:
+            raise ValueError(f"Unsupported recording version {version}")
+        offset += 2
+        start_level, offset = read_varint(data, offset)
+        tick_count, offset = read_varint(data, offset)
+        run_count, offset = read_varint(data, offset)
+
+        codes = np.empty(tick_count, dtype=np.int8)
+        position = 0
+        for _ in range(run_count):
+            run, offset = read_varint(data, offset)
+            length = run >> _CODE_BITS
+            codes[position:position + length] = run & _CODE_MASK
+            position += length
+        if position != tick_count:
+            raise ValueError("Corrupt recording: run lengths don't match the tick count")
+
+        intensities = frequencies = None
+        if flags & FLAG_FEATURES:
+            intensities, offset = _read_deltas(data, offset, tick_count)
+            intensities = intensities / _INTENSITY_SCALE
+            frequencies, offset = _read_deltas(data, offset, tick_count)
+        return cls(codes, start_level, intensities, frequencies)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def runs(self):
+        """``(code, length)`` pairs of consecutive equal ticks"""
+        codes = self.codes
+        if not len(codes):
+            return []
+        starts = np.flatnonzero(np.diff(codes)) + 1
+        bounds = np.concatenate(([0], starts, [len(codes)]))
+        return [(int(codes[a]), int(b - a)) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def replay(recording, sim=None):
+    """Feed a recording back through the simulation as fast as possible.
+
+    Every tick goes through ``Player.update`` exactly as it did live, so the
+    same recording always ends in the same state. Returns a report dict.
+    """
+    if sim is None:
+        sim = simulation.Simulation()
+        if recording.start_level:
+            for _ in range(recording.start_level):
+                sim.level_manager.next_level()
+            spawn_x, spawn_y = sim.level_manager.get_current_level().spawn_point
+            sim.player.reset(spawn_x, spawn_y)
+
+    outcomes = {simulation.LEVEL_COMPLETE: 0, simulation.VICTORY: 0, simulation.GAME_OVER: 0}
+    start = time.perf_counter()
+    for code, length in recording.runs():
+        if code == PAUSED:
+            for _ in range(length):
+                sim.pause_step()
+            continue
+        action = ACTIONS[code]
+        for _ in range(length):
+            outcome = sim.step(action)
+            if outcome != simulation.PLAYING:
+                outcomes[outcome] += 1
+    elapsed = time.perf_counter() - start
+
+    report = sim.get_state()
+    report["outcomes"] = outcomes
+    report["elapsed"] = elapsed
+    return report
+
+
+def main():
+    from src.headless import init_headless_display
+
+    parser = argparse.ArgumentParser(description="Replay a recorded session headlessly")
+    parser.add_argument("recording", help="session file written by the game")
+    args = parser.parse_args()
+
+    recording = SessionRecording.load(args.recording)
+    init_headless_display()
+    report = replay(recording)
+    player = report["player"]
+    print(f"Replayed {len(recording)} ticks ({len(recording) / TICK_RATE / 60:.1f} min of play) "
+          f"in {report['elapsed'] * 1000:.1f} ms")
+    print(f"Level: {report['level']}  outcomes: {report['outcomes']}")
+    print(f"Player: x={player['x']} y={player['y']} on_ground={player['on_ground']}")
+
+
+if __name__ == "__main__":
+    main()
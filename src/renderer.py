@@ -0,0 +1,141 @@
+import pygame
+
+
+def merge_rects(rects):
+    """Merge overlapping rects into their unions so no area is drawn twice"""
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        i = 0
+        while i < len(merged):
+            if rect.colliderect(merged[i]):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectRenderer:
+    """Tracks which parts of the game surface change from frame to frame.
+
+    Every frame the game marks where its moving things are drawn. The
+    regions to redraw are those rects plus the ones marked the frame
+    before, which is where the same things have to be erased. After
+    ``invalidate`` (a resize, a new screen) the next frame is drawn and
+    presented in full.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = pygame.Rect(bounds)
+        self.full_redraw = True
+        self._current = []
+        self._previous = []
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def mark(self, rect):
+        """Record that something is drawn inside ``rect`` this frame"""
+        rect = self.bounds.clip(rect)
+        if rect.width and rect.height:
+            self._current.append(rect)
+
+    def regions(self):
+        """Rects of the game surface to redraw this frame"""
+        return merge_rects(self._previous + self._current)
+
+    def end_frame(self):
+        self._previous, self._current = self._current, self._previous
+        self._current.clear()
+        self.full_redraw = False
+
+
+class RenderTarget:
+    """Puts the fixed-size game surface into the window, scaled and centered.
+
+    ``quality`` picks how: "fast" scales nearest-neighbour, "smooth" filters,
+    and "integer" uses the largest whole-number scale that fits (nearest-
+    neighbour, so pixels stay square) and letterboxes the rest. At 1:1 the
+    surface is copied without scaling. The background is scaled to the
+    window once per size, not every frame.
+    """
+
+    def __init__(self, surface_size, window_size, quality="fast", background=None):
+        self.surface_size = surface_size
+        self.quality = quality
+        self.original_background = background
+        self.resize(window_size)
+
+    def resize(self, window_size):
+        self.window_size = window_size
+        width, height = self.surface_size
+        scale = min(window_size[0] / width, window_size[1] / height)
+        if self.quality == "integer" and scale >= 1:
+            scale = int(scale)
+        self.scale = scale
+        view_width, view_height = int(width * scale), int(height * scale)
+        self.view = pygame.Rect((window_size[0] - view_width) // 2, (window_size[1] - view_height) // 2,
+                                view_width, view_height)
+        self._scaled = None
+        self._background = None
+
+    @property
+    def background(self):
+        """The background scaled to the window"""
+        if self._background is None and self.original_background is not None:
+            self._background = pygame.transform.scale(self.original_background, self.window_size)
+        return self._background
+
+    def _scale(self, surface, size, *dest):
+        if self.quality == "smooth":
+            return pygame.transform.smoothscale(surface, size, *dest)
+        return pygame.transform.scale(surface, size, *dest)
+
+    def to_surface(self, pos):
+        """Window position to game surface coordinates"""
+        return (int((pos[0] - self.view.x) / self.scale),
+                int((pos[1] - self.view.y) / self.scale))
+
+    def present(self, screen, surface):
+        """Copy all of ``surface`` into the view"""
+        if self.scale == 1:
+            screen.blit(surface, self.view)
+            return
+        if self._scaled is None:
+            self._scaled = pygame.Surface(self.view.size, surface.get_flags(), surface)
+        screen.blit(self._scale(surface, self.view.size, self._scaled), self.view)
+
+    def present_regions(self, screen, surface, regions):
+        """Copy ``regions`` of ``surface`` into the view.
+
+        Returns the screen rects to pass to ``pygame.display.update``. Only
+        whole-number nearest-neighbour scales map each region to the same
+        pixels as scaling the whole surface; at any other scale a region
+        scaled alone would leave seams at its edges, so the whole surface is
+        presented instead.
+        """
+        scale = self.scale
+        if scale != int(scale) or (scale != 1 and self.quality == "smooth"):
+            if not regions:
+                return []
+            # Downscaling can leave edge pixels translucent; start from the
+            # background under the view, as a full redraw does
+            if self.background is not None:
+                screen.blit(self.background, self.view, self.view)
+            self.present(screen, surface)
+            return [self.view]
+            
+        scale = int(scale)
+        updated = []
+        for region in regions:
+            if scale == 1:
+                target = region.move(self.view.topleft)
+                screen.blit(surface, target, region)
+            else:
+                target = pygame.Rect(region.x * scale + self.view.x, region.y * scale + self.view.y,
+                                     region.width * scale, region.height * scale)
+                screen.blit(self._scale(surface.subsurface(region), target.size), target)
+            updated.append(target)
+        return updated
@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class RingBuffer:
+    """Preallocated single-producer/single-consumer ring of audio blocks.
+
+    Each slot holds one raw sample block and the feature row derived from it.
+    The producer (the audio callback) only copies into existing arrays and then
+    publishes the slot by bumping ``write_index``, so it never allocates. The
+    consumer (the game loop) copies rows out and re-checks ``write_index`` to
+    make sure the producer did not lap it while it was reading.
+
+    The producer may be writing the slot after the newest published one at
+    any moment, and that slot holds the oldest row, so at most
+    ``capacity - 1`` rows can be read at once.
+
+    All state, including ``write_index``, lives in one flat buffer, which can
+    be a ``multiprocessing.shared_memory`` block so that producer and consumer
+    run in different processes.
+    """
+
+    def __init__(self, capacity, block_size, feature_size, buffer=None):
+        self.capacity = capacity
+        self.block_size = block_size
+        self.feature_size = feature_size
+
+        if buffer is None:
+            buffer = bytearray(self.nbytes(capacity, block_size, feature_size))
+        blocks_offset = 8
+        features_offset = blocks_offset + self._aligned(capacity * block_size * 4)
+
+        # Total number of slots ever published; only the producer writes it
+        self._header = np.ndarray((1,), dtype=np.int64, buffer=buffer)
+        self.blocks = np.ndarray((capacity, block_size), dtype=np.float32,
+                                 buffer=buffer, offset=blocks_offset)
+        self.features = np.ndarray((capacity, feature_size), dtype=np.float64,
+                                   buffer=buffer, offset=features_offset)
+
+    @staticmethod
+    def _aligned(size):
+        return (size + 7) // 8 * 8
+
+    @classmethod
+    def nbytes(cls, capacity, block_size, feature_size):
+        """Size of the flat buffer backing a ring of these dimensions"""
+        return 8 + cls._aligned(capacity * block_size * 4) + capacity * feature_size * 8
+
+    @property
+    def write_index(self):
+        return int(self._header[0])
+
+    @write_index.setter
+    def write_index(self, value):
+        self._header[0] = value
+
+    def release(self):
+        """Drop the views into the backing buffer so shared memory can be closed"""
+        self._header = self.blocks = self.features = None
+
+    def write(self, block, features):
+        """Copy one block and its features into the next slot (producer only)"""
+        slot = self.write_index % self.capacity
+        frames = min(len(block), self.block_size)
+        self.blocks[slot, :frames] = block[:frames]
+        if frames < self.block_size:
+            self.blocks[slot, frames:] = 0
+        self.features[slot] = features
+
+        # Publish only after the slot is fully written
+        self.write_index += 1
+
+    def read_latest(self, out, blocks_out=None):
+        """Copy the newest ``len(out)`` feature rows into ``out``, oldest first.
+
+        Returns the number of valid rows, which is smaller than ``len(out)``
+        until the producer has written that many blocks. If ``blocks_out`` is
+        given, the matching raw blocks are copied into it as well.
+        """
+        count = len(out)
+        while True:
+            end = self.write_index
+            valid = min(count, end, self.capacity - 1)
+            self._copy_rows(end - valid, end, out, blocks_out)
+
+            # The snapshot is consistent unless the producer started writing
+            # one of the slots we just copied: row start + capacity reuses the
+            # slot of row start and is in flight once write_index reaches it
+            if self.write_index - (end - valid) < self.capacity:
+                return valid
+
+    def read_since(self, index, out):
+        """Copy rows published after ``index`` into ``out``, oldest first.
+
+        Returns ``(count, next_index)``. Rows that were already overwritten are
+        skipped, so a slow consumer loses the oldest data rather than blocking
+        the producer.
+        """
+        while True:
+            end = self.write_index
+            start = max(index, end - self.capacity + 1, end - len(out))
+            count = end - start
+            self._copy_rows(start, end, out, None)
+
+            if self.write_index - start < self.capacity:
+                return count, end
+
+    def _copy_rows(self, start, end, out, blocks_out):
+        """Copy absolute rows ``[start, end)`` handling wrap-around"""
+        count = end - start
+        if count <= 0:
+            return
+        first = start % self.capacity
+        head = min(count, self.capacity - first)
+        out[:head] = self.features[first:first + head]
+        out[head:count] = self.features[:count - head]
+        if blocks_out is not None:
+            blocks_out[:head] = self.blocks[first:first + head]
+            blocks_out[head:count] = self.blocks[:count - head]
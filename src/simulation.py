@@ -0,0 +1,78 @@
+from config.settings import *
+from src.level_manager import LevelManager
+from src.player import Player
+
+# Results of one simulation tick
+PLAYING = "playing"
+LEVEL_COMPLETE = "level_complete"
+VICTORY = "victory"
+GAME_OVER = "game_over"
+
+
+class Simulation:
+    """Gameplay rules for one run, independent of rendering and input.
+
+    Owns the player and level manager and advances them one fixed tick at a
+    time from an action name, so the same rules drive the windowed game, the
+    headless runner and replays.
+    """
+
+    def __init__(self, level_manager=None, player=None):
+        self.level_manager = level_manager or LevelManager()
+        if player is None:
+            spawn_x, spawn_y = self.level_manager.get_current_level().spawn_point
+            player = Player(spawn_x, spawn_y)
+        self.player = player
+        self.ticks = 0
+
+    def step(self, action, action_timing=None):
+        """Advance one tick with ``action`` and return the outcome"""
+        current_level = self.level_manager.get_current_level()
+        outcome = PLAYING
+
+        # Update player with the platforms it can reach (static and moving)
+        colliders = current_level.get_colliders(self.player.get_collision_bounds())
+        self.player.update(action, colliders, action_timing)
+
+        # Check for level completion
+        if self.player.rect.colliderect(current_level.exit_rect):
+            if self.level_manager.has_next_level():
+                self.level_manager.next_level()
+                spawn_x, spawn_y = self.level_manager.get_current_level().spawn_point
+                self.player.reset(spawn_x, spawn_y)
+                outcome = LEVEL_COMPLETE
+            else:
+                outcome = VICTORY
+
+        # Check for death (falling off screen or hitting hazards)
+        if self.player.rect.top > WINDOW_HEIGHT or current_level.touches_hazard(self.player.rect):
+            outcome = GAME_OVER
+
+        # Update moving platforms
+        current_level.update()
+        self.ticks += 1
+        return outcome
+
+    def pause_step(self):
+        """Advance one paused tick: platforms keep moving, the player doesn't"""
+        # Hold the player where it stopped so drawing doesn't interpolate
+        self.player.previous_x = self.player.rect.x
+        self.player.previous_y = self.player.rect.y
+        self.level_manager.get_current_level().update()
+        self.ticks += 1
+
+    def get_state(self):
+        """Snapshot of the run for reports"""
+        player = self.player
+        return {
+            "tick": self.ticks,
+            "level": self.level_manager.current_level_index,
+            "player": {
+                "x": player.rect.x,
+                "y": player.rect.y,
+                "velocity_x": player.velocity_x,
+                "velocity_y": player.velocity_y,
+                "on_ground": player.on_ground,
+                "is_dashing": player.is_dashing
+            }
+        }
@@ -1,80 +1,182 @@
+import json
 import numpy as np
-import sounddevice as sd
-from scipy.fft import fft
-from collections import deque
 import threading
 import time
+from config.settings import (DEFAULT_ACTION_COOLDOWN, DEFAULT_DASH_THRESHOLD, DEFAULT_JUMP_THRESHOLD,
+                             DEFAULT_NOISE_FLOOR, DEFAULT_SUSTAINED_THRESHOLD, DEFAULT_WALK_THRESHOLD)
+from src.analysis_process import AnalysisProcess
+from src.audio_source import LiveAudioSource
+from src.calibration import StreamingCalibrator
+from src.audio_analysis import (AnalysisPlan, SlidingWindow, FEATURE_INTENSITY, FEATURE_PEAKS,
+                                FEATURE_PITCH, FEATURE_PITCH_CONFIDENCE, FEATURE_TIMESTAMP,
+                                FEATURE_SIZE)
+from src.ring_buffer import RingBuffer
+
+# Settings that set_thresholds and tuned profiles may change
+TUNABLE_SETTINGS = ("noise_floor", "walk_threshold", "jump_threshold", "dash_threshold",
+                    "action_cooldown", "sustained_threshold")
 
 class SoundProcessor:
-    def __init__(self, sample_rate=44100, window_size=1024, history_size=10):
+    def __init__(self, sample_rate=44100, window_size=1024, history_size=10,
+                 ring_capacity=64, source=None, latency_tracker=None, hop_size=None,
+                 use_pitch=False, separate_process=False, ring=None):
         self.sample_rate = sample_rate
         self.window_size = window_size
         self.history_size = history_size
         
-        # Sound intensity tracking
+        # Overlapped analysis: blocks of hop_size samples slide through a
+        # window_size FFT window (hop_size == window_size disables overlap)
+        self.hop_size = min(hop_size or window_size, window_size)
+        self.sliding_window = SlidingWindow(window_size) if self.hop_size < window_size else None
+        # History rules count in windows; with overlap each window spans several blocks
+        self.blocks_per_window = max(1, window_size // self.hop_size)
+        self.history_blocks = history_size * self.blocks_per_window
+        
+        # Blocks and features shared between the audio thread and the game loop.
+        # With separate_process, capture and analysis run in a child process
+        # that publishes into a shared-memory ring instead.
+        # One slot more than the history, as the ring never lends out its last slot
+        capacity = max(ring_capacity, self.history_blocks + 1)
+        self.analysis_process = None
+        if separate_process:
+            self.analysis_process = AnalysisProcess(capacity, self.hop_size, {
+                "sample_rate": sample_rate,
+                "window_size": window_size,
+                "history_size": history_size,
+                "ring_capacity": capacity,
+                "hop_size": self.hop_size,
+                "use_pitch": use_pitch
+            }, source)
+            self.ring = self.analysis_process.ring
+        else:
+            self.ring = ring if ring is not None else RingBuffer(capacity, self.hop_size, FEATURE_SIZE)
+        self._feature_row = np.zeros(FEATURE_SIZE)
+        self._smoothed_intensity = 0.0
+        # Same smoothing time constant whatever the hop (0.7 per full window)
+        self._smoothing = 0.7 ** (self.hop_size / window_size)
+        
+        # Sound intensity tracking (game thread view, refreshed from the ring)
+        self._snapshot = np.zeros((self.history_blocks, FEATURE_SIZE))
         self.current_intensity = 0
-        self.intensity_history = deque(maxlen=history_size)
-        self.frequency_peaks = []
+        self.intensity_history = self._snapshot[:0, FEATURE_INTENSITY]
+        self.frequency_peaks = self._feature_row[FEATURE_PEAKS].copy()
+        self.block_timestamp = 0.0
+        
+        # Input latency: (block arrival, decision) perf_counter pair of the last action
+        self.latency_tracker = latency_tracker
+        self.last_action_timing = None
         
         # Thresholds (can be calibrated)
-        self.noise_floor = 0.05  # Increased noise floor
-        self.walk_threshold = 0.1  # Increased walk threshold
-        self.jump_threshold = 0.2
-        self.dash_threshold = 0.15
+        self.noise_floor = DEFAULT_NOISE_FLOOR
+        self.walk_threshold = DEFAULT_WALK_THRESHOLD
+        self.jump_threshold = DEFAULT_JUMP_THRESHOLD
+        self.dash_threshold = DEFAULT_DASH_THRESHOLD
         
         # Debounce settings
-        self.last_action_time = 0
-        self.action_cooldown = 0.1  # Seconds between actions
-        self.sustained_threshold = 0.05  # How long sound must be sustained
-        self.action_start_time = 0
+        self.last_action_time = float("-inf")
+        self.action_cooldown = DEFAULT_ACTION_COOLDOWN  # Seconds between actions
+        self.sustained_threshold = DEFAULT_SUSTAINED_THRESHOLD  # How long sound must be sustained
+        self.action_start_time = None
         
         # Frequency ranges for different actions
         self.whistle_range = (1000, 3000)  # Hz
         self.hum_range = (100, 400)        # Hz
         
+        self.analysis_plan = AnalysisPlan(sample_rate, window_size,
+                                          self.whistle_range, self.hum_range)
+        
+        # Use the estimated fundamental instead of raw FFT peaks for whistle/hum
+        if use_pitch and not self.analysis_plan.pitch_available:
+            print(f"Pitch detection needs a window of at least {self.analysis_plan.pitch_estimator.frame_size} "
+                  f"samples, got {window_size}; using FFT peaks")
+            use_pitch = False
+        self.use_pitch = use_pitch
+        self.pitch_confidence = 0.6
+        self._no_peaks = np.zeros(0)
+        
         # State tracking
         self.is_calibrating = False
-        self.calibration_samples = []
-        
-        # Start audio stream
-        self.stream = sd.InputStream(
-            channels=1,
-            samplerate=self.sample_rate,
-            callback=self._audio_callback,
-            blocksize=self.window_size
-        )
-        self.stream.start()
-
-    def _audio_callback(self, indata, frames, time, status):
+        self.calibrator = None
+        self._calibration_index = 0
+        self._calibration_rows = np.zeros((self.ring.capacity, FEATURE_SIZE))
+        
+        # Start audio stream (microphone unless another source is given)
+        if self.analysis_process:
+            self.source = None
+            self.analysis_process.start()
+        else:
+            self.source = source if source is not None else LiveAudioSource()
+            self.source.open(self._audio_callback, self.sample_rate, self.hop_size)
+            self.source.start()
+
+    def _audio_callback(self, indata, frames, time_info, status):
+        arrival_time = time.perf_counter()
         if status:
             print(f"Status: {status}")
             return
             
-        # Calculate current intensity with smoothing
-        new_intensity = np.linalg.norm(indata) / np.sqrt(len(indata))
-        self.current_intensity = self.current_intensity * 0.7 + new_intensity * 0.3  # Smoothing
-        self.intensity_history.append(self.current_intensity)
+        block = indata[:, 0]
+        window = None
+        if self.sliding_window:
+            self.sliding_window.push(block)
+            window = self.sliding_window.view()
+            if window is None:
+                window = block  # still filling up; too short for spectral features
         
-        # Perform FFT for frequency analysis
-        if len(indata) >= self.window_size:
-            fft_data = fft(indata[:self.window_size, 0])
-            frequencies = np.fft.fftfreq(self.window_size, 1/self.sample_rate)
-            self.frequency_peaks = frequencies[np.argsort(np.abs(fft_data))[-5:]]
+        # Spectral features (kept from the previous block if the window is short)
+        row = self.analysis_plan.analyze(block, self._feature_row, window)
         
-        # Update calibration if active
-        if self.is_calibrating:
-            self.calibration_samples.append(self.current_intensity)
+        # Smooth the raw block intensity
+        new_intensity = row[FEATURE_INTENSITY]
+        self._smoothed_intensity = self._smoothed_intensity * self._smoothing + new_intensity * (1 - self._smoothing)  # Smoothing
+        row[FEATURE_INTENSITY] = self._smoothed_intensity
+        row[FEATURE_TIMESTAMP] = arrival_time
+        
+        # Hand the block over to the game thread
+        self.ring.write(block, row)
+
+    def _refresh(self):
+        """Take a consistent snapshot of the newest blocks from the ring buffer"""
+        count = self.ring.read_latest(self._snapshot)
+        if count:
+            latest = self._snapshot[count - 1]
+            self.current_intensity = latest[FEATURE_INTENSITY]
+            if not self.use_pitch:
+                self.frequency_peaks = latest[FEATURE_PEAKS]
+            elif latest[FEATURE_PITCH_CONFIDENCE] >= self.pitch_confidence:
+                self.frequency_peaks = latest[FEATURE_PITCH:FEATURE_PITCH + 1]
+            else:
+                self.frequency_peaks = self._no_peaks
+            self.block_timestamp = latest[FEATURE_TIMESTAMP]
+            self.intensity_history = self._snapshot[:count, FEATURE_INTENSITY]
 
     def start_calibration(self, duration=5):
-        """Start microphone calibration"""
+        """Start microphone calibration without blocking.
+
+        Call update_calibration() every frame until it returns the thresholds.
+        """
+        self.calibrator = StreamingCalibrator(duration)
+        self.calibrator.start(time.monotonic())
+        self._calibration_index = self.ring.write_index
         self.is_calibrating = True
-        self.calibration_samples = []
-        time.sleep(duration)
+
+    def update_calibration(self):
+        """Feed new blocks to the calibrator; return the thresholds once done"""
+        if not self.is_calibrating:
+            return None
+            
+        count, self._calibration_index = self.ring.read_since(
+            self._calibration_index, self._calibration_rows)
+        for intensity in self._calibration_rows[:count, FEATURE_INTENSITY]:
+            self.calibrator.add(intensity)
+            
+        if not self.calibrator.is_done(time.monotonic()):
+            return None
         self.is_calibrating = False
         
-        if self.calibration_samples:
+        if self.calibrator.count:
             # Update thresholds based on calibration
-            ambient_noise = np.mean(self.calibration_samples)
+            ambient_noise = self.calibrator.mean
             self.noise_floor = ambient_noise * 1.5
             self.walk_threshold = ambient_noise * 3
             self.jump_threshold = ambient_noise * 8
@@ -87,22 +189,38 @@ class SoundProcessor:
             "dash_threshold": self.dash_threshold
         }
 
+    def get_calibration_time_left(self):
+        """Seconds left in the running calibration (0 when idle)"""
+        if not self.is_calibrating:
+            return 0.0
+        return self.calibrator.time_left(time.monotonic())
+
     def get_action(self):
         """Determine the current action based on sound input"""
-        current_time = time.time()
+        self._refresh()
+        action = self._decide_action(time.time())
         
+        if action != "none":
+            decision_time = time.perf_counter()
+            self.last_action_timing = (self.block_timestamp, decision_time)
+            if self.latency_tracker:
+                self.latency_tracker.record_action(self.block_timestamp, decision_time)
+        return action
+
+    def _decide_action(self, current_time):
+        """Apply cooldown, sustain and threshold rules to the current snapshot"""
         # Enforce cooldown between actions
         if current_time - self.last_action_time < self.action_cooldown:
             return "none"
             
         # Check if sound is sustained enough
         if self.current_intensity > self.noise_floor:
-            if self.action_start_time == 0:
+            if self.action_start_time is None:
                 self.action_start_time = current_time
             elif current_time - self.action_start_time < self.sustained_threshold:
                 return "none"
         else:
-            self.action_start_time = 0
+            self.action_start_time = None
             return "none"
             
         # Reset cooldown timer
@@ -128,23 +246,86 @@ class SoundProcessor:
         
         # Check for walk (talking)
         if self.current_intensity >= self.walk_threshold:
-            # Additional check for sustained sound
-            if len(self.intensity_history) >= 3:
-                if all(i >= self.walk_threshold for i in list(self.intensity_history)[-3:]):
+            # Additional check for sustained sound (the last 3 windows)
+            walk_blocks = 3 * self.blocks_per_window
+            if len(self.intensity_history) >= walk_blocks:
+                if all(i >= self.walk_threshold for i in self.intensity_history[-walk_blocks:]):
                     return "walk"
             
         return "none"
 
+    def get_thresholds(self):
+        """Current decision settings, as used by the batch action classifier"""
+        return {
+            "noise_floor": self.noise_floor,
+            "walk_threshold": self.walk_threshold,
+            "jump_threshold": self.jump_threshold,
+            "dash_threshold": self.dash_threshold,
+            "action_cooldown": self.action_cooldown,
+            "sustained_threshold": self.sustained_threshold,
+            "whistle_range": self.whistle_range,
+            "hum_range": self.hum_range,
+            "use_pitch": self.use_pitch,
+            "pitch_confidence": self.pitch_confidence,
+            "blocks_per_window": self.blocks_per_window
+        }
+
+    def set_thresholds(self, thresholds):
+        """Apply the TUNABLE_SETTINGS present in ``thresholds``; other keys are ignored"""
+        for key in TUNABLE_SETTINGS:
+            if key in thresholds:
+                setattr(self, key, thresholds[key])
+
+    def load_profile(self, path):
+        """Apply the thresholds of a profile written by src.threshold_tuner --output"""
+        with open(path) as f:
+            profile = json.load(f)
+        self.set_thresholds(profile["thresholds"])
+
+    def collect_features(self, max_blocks=None):
+        """Pump a non-realtime source and return the feature rows of every block.
+
+        The timestamp column holds the stream time at the end of each block
+        rather than the wall-clock arrival time, so recordings can be fed to
+        src.action_classifier as if they had been captured live.
+        """
+        chunks = []
+        total = 0
+        index = self.ring.write_index
+        buffer = np.zeros((self.ring.capacity, FEATURE_SIZE))
+        while max_blocks is None or total < max_blocks:
+            readable = self.ring.capacity - 1
+            batch = readable if max_blocks is None else min(readable, max_blocks - total)
+            if not self.source.pump(batch):
+                break
+            count, index = self.ring.read_since(index, buffer)
+            chunks.append(buffer[:count].copy())
+            total += count
+            
+        features = np.concatenate(chunks) if chunks else np.zeros((0, FEATURE_SIZE))
+        features[:, FEATURE_TIMESTAMP] = np.arange(1, len(features) + 1) * self.hop_size / self.sample_rate
+        return features
+
     def get_intensity(self):
         """Get current sound intensity"""
+        self._refresh()
         return self.current_intensity
 
     def get_average_intensity(self):
-        """Get average intensity over history window"""
-        return np.mean(self.intensity_history) if self.intensity_history else 0
+        """Get average intensity over the last history_size windows"""
+        self._refresh()
+        return np.mean(self.intensity_history) if len(self.intensity_history) else 0
+
+    def get_dominant_frequency(self):
+        """Strongest FFT peak (or the pitch estimate) of the newest block, 0 if none"""
+        # Peaks are stored weakest first
+        return self.frequency_peaks[-1] if len(self.frequency_peaks) else 0.0
 
     def cleanup(self):
         """Clean up resources"""
-        if self.stream:
-            self.stream.stop()
-            self.stream.close() 
\ No newline at end of file
+        if self.source:
+            self.source.close()
+            self.source = None
+        if self.analysis_process:
+            self.analysis_process.close()
+            self.analysis_process = None 
\ No newline at end of file
@@ -0,0 +1,61 @@
+class SpatialHash:
+    """Uniform grid index of items by their pygame.Rect.
+
+    Each item is registered in every cell its rect overlaps, so a query only
+    looks at the cells around the query rect and its cost depends on how
+    crowded that neighbourhood is, not on how many items exist. Items that
+    move are filed under the whole area they can reach.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self._rects = {}
+        self._order = {}
+        self._order_key = self._order.__getitem__
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self._rects)
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _add_to_cells(self, item, cell_range):
+        x0, y0, x1, y1 = cell_range
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(item)
+
+    def insert(self, item, rect):
+        """Add an item; query results keep insertion order"""
+        cell_range = self._cell_range(rect)
+        self._rects[item] = rect
+        self._order[item] = self._next_order
+        self._next_order += 1
+        self._add_to_cells(item, cell_range)
+
+    def query(self, rect, out=None):
+        """Items whose rects overlap ``rect``, in insertion order.
+
+        Pass a list as ``out`` to have it cleared and refilled instead of
+        building a new one (for queries made every tick).
+        """
+        if out is None:
+            out = []
+        else:
+            out.clear()
+        x0, y0, x1, y1 = self._cell_range(rect)
+        cells = self.cells
+        rects = self._rects
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    for item in cell:
+                        if rect.colliderect(rects[item]) and item not in out:
+                            out.append(item)
+        out.sort(key=self._order_key)
+        return out
@@ -11,6 +11,10 @@ class PlayerState(Enum):
     CROUCHING = "crouching"
 
 class SpriteManager:
+    __slots__ = ("sprites", "current_frame", "animation_speed", "last_update", "current_state",
+                 "facing_right", "transition_time", "transition_duration", "previous_state",
+                 "scale_factor", "frame_counts")
+    
     def __init__(self):
         self.sprites = {}
         self.current_frame = 0
@@ -142,6 +146,13 @@ class SpriteManager:
             surface.fill((255, 0, 0))
             return surface
 
+    def get_frame_size(self):
+        """Size of the surface get_current_frame returns"""
+        try:
+            return self.sprites[self.current_state.value][self.current_frame].get_size()
+        except (KeyError, IndexError):
+            return (50, 50)
+
     def set_direction(self, facing_right):
         """Set the direction the sprite is facing"""
         self.facing_right = facing_right 
\ No newline at end of file
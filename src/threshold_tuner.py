@@ -0,0 +1,194 @@
+"""Search SoundProcessor thresholds against labelled recordings.
+
+Each recording is a WAV file with a sidecar ``<name>.labels.json`` holding a
+list of ``{"start": seconds, "end": seconds, "action": "jump"}`` events. The
+recordings are analysed once, then every threshold combination in the grid is
+scored with the batch action classifier across a process pool.
+
+    python -m src.threshold_tuner recordings/venue_a/*.wav --output venue_a.json
+
+The best values are printed as config/settings.py defaults; the ``--output``
+profile can instead be loaded at startup by pointing SOUND_PROFILE_PATH at it.
+"""
+
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from config.settings import HISTORY_SIZE, HOP_SIZE, USE_PITCH_DETECTION, WINDOW_SIZE
+from src.action_classifier import ACTIONS, ACTION_NONE, candidate_frequencies, classify_action_codes
+from src.audio_analysis import FEATURE_INTENSITY, FEATURE_TIMESTAMP
+from src.audio_source import WavFileSource
+from src.sound_processor import SoundProcessor
+
+# Values tried for each tunable setting
+DEFAULT_GRID = {
+    "noise_floor": [0.02, 0.03, 0.05, 0.08],
+    "walk_threshold": [0.06, 0.1, 0.15],
+    "jump_threshold": [0.15, 0.2, 0.3, 0.4],
+    "dash_threshold": [0.1, 0.15, 0.2],
+    "action_cooldown": [0.05, 0.1, 0.2],
+    "sustained_threshold": [0.0, 0.05, 0.1]
+}
+
+# Where each tuned value lives in config/settings.py
+SETTINGS_NAMES = {
+    "noise_floor": "DEFAULT_NOISE_FLOOR",
+    "walk_threshold": "DEFAULT_WALK_THRESHOLD",
+    "jump_threshold": "DEFAULT_JUMP_THRESHOLD",
+    "dash_threshold": "DEFAULT_DASH_THRESHOLD",
+    "action_cooldown": "DEFAULT_ACTION_COOLDOWN",
+    "sustained_threshold": "DEFAULT_SUSTAINED_THRESHOLD"
+}
+
+
+class Recording:
+    """Features and labelled events of one recording"""
+
+    def __init__(self, name, features, events, thresholds):
+        self.name = name
+        self.timestamps = features[:, FEATURE_TIMESTAMP]
+        self.intensities = features[:, FEATURE_INTENSITY]
+        self.peaks = candidate_frequencies(features, thresholds)
+        self.events = events  # list of (start, end, action code)
+
+
+def load_recording(wav_path, window_size=WINDOW_SIZE, hop_size=HOP_SIZE, history_size=HISTORY_SIZE,
+                   use_pitch=USE_PITCH_DETECTION):
+    """Analyse a WAV file and load its labels"""
+    wav_path = Path(wav_path)
+    labels_path = wav_path.with_suffix(".labels.json")
+    with open(labels_path) as f:
+        labels = json.load(f)
+    events = [(label["start"], label["end"], ACTIONS.index(label["action"])) for label in labels]
+
+    source = WavFileSource(wav_path, realtime=False)
+    processor = SoundProcessor(sample_rate=source.file_sample_rate, window_size=window_size,
+                               hop_size=hop_size, history_size=history_size, source=source,
+                               use_pitch=use_pitch)
+    try:
+        features = processor.collect_features()
+        base_thresholds = processor.get_thresholds()
+    finally:
+        processor.cleanup()
+    return Recording(wav_path.name, features, events, base_thresholds), base_thresholds
+
+
+def score_recording(recording, codes):
+    """Return (hits, events, false alarms, summed hit latency)"""
+    fired = np.flatnonzero(codes != ACTION_NONE)
+    times = recording.timestamps[fired]
+    actions = codes[fired]
+    explained = np.zeros(len(fired), dtype=bool)
+
+    hits = 0
+    latency = 0.0
+    for start, end, action in recording.events:
+        lo, hi = np.searchsorted(times, [start, end], side="left")
+        in_event = slice(lo, hi)
+        matches = np.flatnonzero(actions[in_event] == action)
+        explained[in_event] |= actions[in_event] == action
+        if len(matches):
+            hits += 1
+            latency += times[lo + matches[0]] - start
+    return hits, len(recording.events), int((~explained).sum()), latency
+
+
+# Per-worker state, set once by the pool initializer
+_recordings = None
+_history_size = None
+
+
+def _init_worker(recordings, history_size):
+    global _recordings, _history_size
+    _recordings = recordings
+    _history_size = history_size
+
+
+def evaluate(thresholds):
+    """Score one threshold combination over all recordings"""
+    hits = events = false_alarms = 0
+    latency = 0.0
+    for recording in _recordings:
+        codes = classify_action_codes(recording.timestamps, recording.intensities,
+                                      recording.peaks, thresholds, _history_size)
+        r_hits, r_events, r_false, r_latency = score_recording(recording, codes)
+        hits += r_hits
+        events += r_events
+        false_alarms += r_false
+        latency += r_latency
+
+    denominator = events + false_alarms
+    return {
+        "thresholds": thresholds,
+        "accuracy": hits / denominator if denominator else 0.0,
+        "hits": hits,
+        "events": events,
+        "false_alarms": false_alarms,
+        "mean_latency": latency / hits if hits else None
+    }
+
+
+def iter_candidates(grid, base_thresholds):
+    """All grid combinations with ordered thresholds (floor < walk < jump)"""
+    keys = list(grid)
+    for values in itertools.product(*(grid[key] for key in keys)):
+        candidate = dict(base_thresholds)
+        candidate.update(zip(keys, values))
+        if candidate["noise_floor"] < candidate["walk_threshold"] < candidate["jump_threshold"]:
+            yield candidate
+
+
+def tune(recordings, base_thresholds, grid=DEFAULT_GRID, history_size=HISTORY_SIZE, workers=None):
+    """Evaluate the grid in a process pool; best results first"""
+    candidates = list(iter_candidates(grid, base_thresholds))
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(candidates) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(recordings, history_size)) as pool:
+        results = list(pool.map(evaluate, candidates, chunksize=chunksize))
+
+    results.sort(key=lambda r: (-r["accuracy"], r["mean_latency"] if r["mean_latency"] is not None else float("inf")))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune sound thresholds on labelled recordings")
+    parser.add_argument("recordings", nargs="+", help="WAV files with .labels.json sidecars")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: all cores)")
+    parser.add_argument("--top", type=int, default=5, help="number of results to print")
+    parser.add_argument("--output", help="write the best settings to this JSON file")
+    args = parser.parse_args()
+
+    recordings = []
+    base_thresholds = None
+    for path in args.recordings:
+        recording, base_thresholds = load_recording(path)
+        recordings.append(recording)
+        print(f"Loaded {recording.name}: {len(recording.timestamps)} blocks, {len(recording.events)} events")
+
+    results = tune(recordings, base_thresholds, workers=args.workers)
+    for result in results[:args.top]:
+        latency = result["mean_latency"]
+        latency_text = f"{latency * 1000:.0f} ms" if latency is not None else "n/a"
+        tuned = ", ".join(f"{key}={result['thresholds'][key]}" for key in DEFAULT_GRID)
+        print(f"accuracy {result['accuracy']:.3f}  latency {latency_text}  {tuned}")
+
+    best = results[0]
+    print("\nSuggested config/settings.py values:")
+    for key, name in SETTINGS_NAMES.items():
+        print(f"{name} = {best['thresholds'][key]}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(best, f, indent=2)
+        print(f'\nor load the profile instead: SOUND_PROFILE_PATH = "{args.output}"')
+
+
+if __name__ == "__main__":
+    main()
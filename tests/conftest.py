@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Run from the repository root so ``src``, ``config`` and ``benchmarks`` import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.headless import init_headless_display
+
+init_headless_display()
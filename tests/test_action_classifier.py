@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from src.action_classifier import classify_features
+from src.audio_analysis import (FEATURE_INTENSITY, FEATURE_PEAKS, FEATURE_PITCH, FEATURE_PITCH_CONFIDENCE,
+                                FEATURE_SIZE, FEATURE_TIMESTAMP, N_PEAKS)
+from src.audio_source import SyntheticSource
+from src.sound_processor import SoundProcessor
+
+TRIALS = 30
+ROWS = 3000
+# In and around the whistle and hum bands
+FREQUENCIES = [50.0, 100.0, 250.0, 400.0, 700.0, 1000.0, 2000.0, 3000.0, 5000.0]
+OUT_OF_BANDS = 700.0
+
+
+def random_features(rng, rows):
+    features = np.zeros((rows, FEATURE_SIZE))
+    # Non-decreasing times, with repeats and gaps around the cooldown and sustain times
+    features[:, FEATURE_TIMESTAMP] = np.cumsum(rng.choice([0.0, 0.005, 0.0116, 0.03, 0.12], rows))
+    # Levels held for runs of blocks, so the walk rule's history check can pass
+    changes = np.flatnonzero(rng.random(rows) < 0.1)
+    held = np.zeros(rows, dtype=int)
+    held[changes] = changes
+    features[:, FEATURE_INTENSITY] = rng.uniform(0.0, 0.3, rows)[np.maximum.accumulate(held)]
+    features[:, FEATURE_PEAKS] = rng.choice(FREQUENCIES, (rows, N_PEAKS))
+    # Some rows with no peak in either band
+    features[rng.random(rows) < 0.5, FEATURE_PEAKS] = OUT_OF_BANDS
+    features[:, FEATURE_PITCH] = rng.choice(FREQUENCIES, rows)
+    features[:, FEATURE_PITCH_CONFIDENCE] = rng.uniform(0.0, 1.0, rows)
+    return features
+
+
+def live_actions(processor, features):
+    """Feed rows through the ring one at a time, deciding after each like get_action()"""
+    block = np.zeros(processor.hop_size)
+    actions = []
+    for row in features:
+        processor.ring.write(block, row)
+        processor._refresh()
+        actions.append(processor._decide_action(row[FEATURE_TIMESTAMP]))
+    return actions
+
+
+@pytest.mark.parametrize("hop_size", [2048, 512])
+@pytest.mark.parametrize("use_pitch", [False, True])
+def test_batch_classifier_matches_live_decisions(use_pitch, hop_size):
+    mismatches = 0
+    for seed in range(TRIALS):
+        processor = SoundProcessor(window_size=2048, hop_size=hop_size, use_pitch=use_pitch,
+                                   source=SyntheticSource(realtime=False))
+        try:
+            features = random_features(np.random.default_rng(seed), ROWS)
+            expected = classify_features(features, processor.get_thresholds(), processor.history_size)
+            mismatches += int(np.sum(np.array(live_actions(processor, features)) != expected))
+        finally:
+            processor.cleanup()
+    assert mismatches == 0
@@ -0,0 +1,5 @@
+from benchmarks.allocation_check import check_levels, over_budget
+
+
+def test_tick_paths_stay_within_allocation_budgets():
+    assert over_budget(check_levels()) == []
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from src.calibration import P2Quantile, StreamingCalibrator
+
+
+def calibrated(samples):
+    calibrator = StreamingCalibrator(duration=1)
+    for value in samples:
+        calibrator.add(value)
+    return calibrator
+
+
+def test_streaming_statistics_match_numpy():
+    samples = np.random.default_rng(0).lognormal(-3.0, 0.5, 5000)
+    calibrator = calibrated(samples)
+    assert calibrator.count == len(samples)
+    assert calibrator.mean == pytest.approx(samples.mean(), rel=1e-9)
+    assert calibrator.std == pytest.approx(samples.std(ddof=1), rel=1e-9)
+    assert calibrator.percentile(0.5) == pytest.approx(np.percentile(samples, 50), rel=0.02)
+    assert calibrator.percentile(0.95) == pytest.approx(np.percentile(samples, 95), rel=0.02)
+
+
+@pytest.mark.parametrize("count", range(1, 6))
+def test_few_samples_use_the_exact_order_statistic(count):
+    values = [0.4, 0.1, 0.5, 0.2, 0.3][:count]
+    for p in (0.0, 0.5, 0.95, 1.0):
+        quantile = P2Quantile(p)
+        for value in values:
+            quantile.add(value)
+        ordered = sorted(values)
+        assert quantile.value() == ordered[min(int(round(p * (count - 1))), count - 1)]
+
+
+def test_empty_calibration():
+    calibrator = StreamingCalibrator(duration=1)
+    assert calibrator.percentile(0.5) == 0.0
+    assert calibrator.std == 0.0
+    assert calibrator.get_stats()["samples"] == 0
+
+
+def test_time_left_counts_down_from_start():
+    calibrator = StreamingCalibrator(duration=2)
+    assert calibrator.time_left(10.0) == 2
+    calibrator.start(10.0)
+    assert calibrator.time_left(10.5) == 1.5
+    assert not calibrator.is_done(11.9)
+    assert calibrator.is_done(12.0) and calibrator.time_left(13.0) == 0.0
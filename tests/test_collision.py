@@ -0,0 +1,68 @@
+import pygame
+
+from config.settings import DASH_SPEED, MAX_FALL_SPEED, WALK_SPEED
+from src.collision import first_hit, sweep_aabb
+from src.player import Player
+
+
+def airborne_player(x, y):
+    player = Player(x, y)
+    player.on_ground = False
+    return player
+
+
+def test_fast_small_rect_does_not_tunnel_through_a_thin_platform():
+    # A 4 px tall rect falling MAX_FALL_SPEED clears a 5 px platform in one step
+    rect = pygame.Rect(0, 0, 10, 4)
+    platform = pygame.Rect(-50, 6, 100, 5)
+    moved = rect.move(0, MAX_FALL_SPEED)
+    assert not moved.colliderect(platform) and moved.top > platform.bottom
+    assert sweep_aabb(rect, 0, MAX_FALL_SPEED, platform) == 2 / MAX_FALL_SPEED
+
+
+def test_fall_at_max_speed_lands_on_a_platform_thinner_than_one_step():
+    player = airborne_player(100, 0)
+    platform = pygame.Rect(0, player.rect.bottom + 3, 400, 5)
+    player.velocity_y = MAX_FALL_SPEED - 0.5  # reaches MAX_FALL_SPEED with gravity
+    player.update("none", [platform])
+    assert player.rect.bottom == platform.top
+    assert player.on_ground and player.velocity_y == 0
+
+
+def test_dash_stops_at_a_thin_wall():
+    player = Player(100, 100)
+    wall = pygame.Rect(player.rect.right + 4, 0, 5, 400)
+    player.is_dashing = True
+    player.dash_ticks_left = 5
+    player.update("none", [wall])
+    assert DASH_SPEED > 4 + wall.width
+    assert player.rect.right == wall.left
+    assert player.on_wall and player.velocity_x == 0
+
+
+def test_touching_the_ground_does_not_block_walking():
+    player = Player(100, 100)
+    ground = pygame.Rect(0, player.rect.bottom, 800, 50)
+    assert sweep_aabb(player.rect, WALK_SPEED, 0, ground) is None
+    player.on_ground = True
+    player.update("walk", [ground])
+    assert player.rect.x > 100
+    assert player.rect.bottom == ground.top
+    assert not player.on_wall
+
+
+def test_touching_a_wall_blocks_moving_into_it():
+    rect = pygame.Rect(0, 0, 10, 10)
+    wall = pygame.Rect(10, -20, 5, 50)
+    assert sweep_aabb(rect, WALK_SPEED, 0, wall) == 0
+
+
+def test_platform_already_overlapping_goes_to_the_overlap_fallback():
+    player = Player(100, 100)
+    # A moving platform that slid into the player's right side
+    platform = pygame.Rect(player.rect.right - 10, player.rect.top, 50, 20)
+    assert first_hit(player.rect, WALK_SPEED, 0, [platform]) == (None, None)
+    player.velocity_x = WALK_SPEED
+    player._move_horizontal([platform])
+    assert player.rect.right == platform.left
+    assert player.on_wall and player.velocity_x == 0
@@ -0,0 +1,46 @@
+from src.level_manager import LevelManager
+
+
+def pack(count):
+    return [{"spawn_point": [5 + index, 5], "exit_point": [50, 5],
+             "platforms": [{"x": 0, "y": 40, "width": 60, "height": 10}]}
+            for index in range(count)]
+
+
+def test_reset_rebuilds_a_custom_level_from_its_own_data():
+    manager = LevelManager(pack(1))
+    manager.reset_level()
+    level = manager.get_current_level()
+    assert level.spawn_point == (5, 5)
+    assert len(level.platforms) == 1
+
+
+def test_reset_works_past_the_builtin_level_count():
+    manager = LevelManager(pack(3))
+    manager.current_level_index = 2
+    manager.reset_level()
+    assert manager.get_current_level().spawn_point == (7, 5)
+
+
+def test_reset_gives_a_fresh_level():
+    manager = LevelManager()
+    before = manager.get_current_level()
+    manager.reset_level()
+    assert manager.get_current_level() is not before
+    assert manager.get_current_level().spawn_point == (100, 450)
+
+
+def test_only_moving_platforms_get_store_rows():
+    level = LevelManager().get_current_level()
+    assert len(level.store) == len(level.moving_platforms) == 1
+
+
+def test_moving_platforms_are_synced_when_queried():
+    level = LevelManager().get_current_level()
+    platform = level.moving_platforms[0]
+    start = platform.rect.x
+    for _ in range(10):
+        level.update()
+    assert level.get_colliders(platform.rect.inflate(100, 0))[-1] is platform.rect
+    assert platform.rect.x == start + 10 * platform.speed
+    assert platform.previous_x == start + 9 * platform.speed
@@ -0,0 +1,49 @@
+import numpy as np
+
+from src.audio_analysis import AnalysisPlan, FEATURE_PITCH, FEATURE_PITCH_CONFIDENCE, FEATURE_SIZE
+from src.audio_source import SyntheticSource
+from src.sound_processor import SoundProcessor
+
+WHISTLE = (1000, 3000)
+HUM = (100, 400)
+
+
+def tone(frequency, size, sample_rate=44100):
+    return 0.5 * np.sin(2 * np.pi * frequency * np.arange(size) / sample_rate)
+
+
+def test_window_long_enough_for_pitch_finds_the_tone():
+    plan = AnalysisPlan(44100, 2048, WHISTLE, HUM)
+    assert plan.pitch_available
+    out = plan.analyze(tone(220, 2048), np.zeros(FEATURE_SIZE))
+    assert abs(out[FEATURE_PITCH] - 220) < 2
+    assert out[FEATURE_PITCH_CONFIDENCE] > 0.9
+
+
+def test_window_shorter_than_pitch_frame_has_no_pitch():
+    plan = AnalysisPlan(44100, 1024, WHISTLE, HUM)
+    assert plan.pitch_estimator.frame_size > 1024
+    assert not plan.pitch_available
+
+
+def test_processor_falls_back_to_fft_peaks_when_window_is_too_short():
+    source = SyntheticSource(frequency=220, realtime=False)
+    processor = SoundProcessor(window_size=1024, use_pitch=True, source=source)
+    try:
+        assert not processor.use_pitch
+        source.pump(4)
+        processor._refresh()
+        assert len(processor.frequency_peaks) > 0
+    finally:
+        processor.cleanup()
+
+
+def test_dominant_frequency_is_the_strongest_peak():
+    source = SyntheticSource(frequency=1000, realtime=False)
+    processor = SoundProcessor(window_size=2048, hop_size=512, source=source)
+    try:
+        source.pump(8)
+        processor._refresh()
+        assert abs(processor.get_dominant_frequency() - 1000) < 44100 / 2048
+    finally:
+        processor.cleanup()
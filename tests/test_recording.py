@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from src import simulation
+from src.action_classifier import ACTIONS
+from src.recording import (PAUSED, SessionRecorder, SessionRecording, _unzigzag, _zigzag,
+                           read_varint, replay, write_varint)
+
+
+def test_varint_round_trip():
+    values = [0, 1, 127, 128, 300, 16383, 16384, 2 ** 35 + 7]
+    out = bytearray()
+    for value in values:
+        write_varint(out, value)
+    offset = 0
+    decoded = []
+    for _ in values:
+        value, offset = read_varint(out, offset)
+        decoded.append(value)
+    assert decoded == values
+    assert offset == len(out)
+
+
+def test_zigzag_round_trip_keeps_negative_deltas_small():
+    deltas = [0, -1, 1, -2, 2, -65535, 65535, -(2 ** 40)]
+    assert [_unzigzag(_zigzag(delta)) for delta in deltas] == deltas
+    assert _zigzag(-1) == 1 and _zigzag(1) == 2
+
+
+def test_features_round_trip_with_falling_values():
+    recorder = SessionRecorder(record_features=True)
+    for intensity, frequency in [(0.5, 2000.0), (0.1, 150.0), (0.0, 0.0), (1.0, 3000.4)]:
+        recorder.record("walk", intensity, frequency)
+    recording = SessionRecording.from_bytes(recorder.to_bytes())
+    assert np.allclose(recording.intensities, [0.5, 0.1, 0.0, 1.0], atol=1e-4)
+    assert list(recording.frequencies) == [2000, 150, 0, 3000]
+
+
+def test_runs_mixing_pauses_and_actions_round_trip():
+    recorder = SessionRecorder(start_level=1)
+    ticks = ["walk"] * 40 + [None] * 300 + ["walk"] * 2 + ["jump"] + [None] + ["none"] * 1000 + ["dash"]
+    for action in ticks:
+        if action is None:
+            recorder.record_pause()
+        else:
+            recorder.record(action)
+    data = recorder.to_bytes()
+    recording = SessionRecording.from_bytes(data)
+
+    expected = [PAUSED if action is None else ACTIONS.index(action) for action in ticks]
+    assert recording.codes.tolist() == expected
+    assert recording.start_level == 1
+    assert recording.runs() == [(ACTIONS.index("walk"), 40), (PAUSED, 300), (ACTIONS.index("walk"), 2),
+                                (ACTIONS.index("jump"), 1), (PAUSED, 1), (ACTIONS.index("none"), 1000),
+                                (ACTIONS.index("dash"), 1)]
+    # Seven runs: a short header plus a byte or two per run
+    assert len(data) < 30
+
+
+def test_truncated_data_is_rejected():
+    recorder = SessionRecorder(record_features=True)
+    for action in ["walk"] * 200 + ["jump"] + ["none"] * 50:
+        recorder.record(action, 0.3, 440.0)
+    data = recorder.to_bytes()
+    for end in range(len(data)):
+        with pytest.raises(ValueError):
+            SessionRecording.from_bytes(data[:end])
+
+
+def test_wrong_magic_is_rejected():
+    data = bytearray(SessionRecorder().to_bytes())
+    data[0:4] = b"RIFF"
+    with pytest.raises(ValueError):
+        SessionRecording.from_bytes(bytes(data))
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_replay_ends_in_the_live_state(seed):
+    rng = np.random.default_rng(seed)
+    live = simulation.Simulation()
+    recorder = SessionRecorder()
+    while len(recorder) < 400:
+        # Held actions and pauses, like real play
+        action = rng.choice(ACTIONS + ("pause",), p=[0.4, 0.3, 0.15, 0.1, 0.0, 0.05])
+        for _ in range(int(rng.integers(1, 30))):
+            if action == "pause":
+                recorder.record_pause()
+                live.pause_step()
+            else:
+                recorder.record(action)
+                live.step(action)
+
+    report = replay(SessionRecording.from_bytes(recorder.to_bytes()))
+    state = live.get_state()
+    assert {key: report[key] for key in state} == state
@@ -0,0 +1,67 @@
+import numpy as np
+
+from src.ring_buffer import RingBuffer
+
+CAPACITY = 4
+
+
+class InFlightRing(RingBuffer):
+    """Ring whose producer starts writing the next slot as the consumer copies"""
+
+    torn = -1.0
+
+    def _copy_rows(self, start, end, out, blocks_out):
+        # Half-written row: in the slot, but write_index not bumped yet
+        self.features[self.write_index % self.capacity] = self.torn
+        super()._copy_rows(start, end, out, blocks_out)
+
+
+def filled(ring_class, rows):
+    ring = ring_class(CAPACITY, 2, 1)
+    for value in range(rows):
+        ring.write(np.zeros(2), [value])
+    return ring
+
+
+def test_read_latest_skips_the_slot_being_written():
+    ring = filled(InFlightRing, CAPACITY)
+    out = np.zeros((CAPACITY, 1))
+    count = ring.read_latest(out)
+    assert count == CAPACITY - 1
+    assert list(out[:count, 0]) == [1, 2, 3]
+
+
+def test_read_since_skips_the_slot_being_written():
+    ring = filled(InFlightRing, CAPACITY)
+    out = np.zeros((CAPACITY, 1))
+    count, next_index = ring.read_since(0, out)
+    assert next_index == CAPACITY
+    assert list(out[:count, 0]) == [1, 2, 3]
+
+
+def test_reads_return_newest_rows_after_wrapping():
+    ring = filled(RingBuffer, 10)
+    out = np.zeros((CAPACITY, 1))
+    count = ring.read_latest(out)
+    assert list(out[:count, 0]) == [7, 8, 9]
+    count, next_index = ring.read_since(8, out)
+    assert (list(out[:count, 0]), next_index) == ([8, 9], 10)
+
+
+class LappingRing(RingBuffer):
+    """Ring whose producer publishes one more row during the first copy"""
+
+    lapped = False
+
+    def _copy_rows(self, start, end, out, blocks_out):
+        super()._copy_rows(start, end, out, blocks_out)
+        if not self.lapped:
+            self.lapped = True
+            self.write(np.zeros(2), [self.write_index])
+
+
+def test_read_latest_retries_when_lapped():
+    ring = filled(LappingRing, CAPACITY)
+    out = np.zeros((CAPACITY, 1))
+    count = ring.read_latest(out)
+    assert list(out[:count, 0]) == [2, 3, 4]
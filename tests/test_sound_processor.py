@@ -0,0 +1,37 @@
+import json
+
+from config.settings import DEFAULT_ACTION_COOLDOWN, DEFAULT_NOISE_FLOOR
+from src.audio_source import SyntheticSource
+from src.sound_processor import SoundProcessor
+
+
+def make_processor():
+    return SoundProcessor(source=SyntheticSource(realtime=False))
+
+
+def test_thresholds_start_from_settings():
+    processor = make_processor()
+    try:
+        thresholds = processor.get_thresholds()
+        assert thresholds["noise_floor"] == DEFAULT_NOISE_FLOOR
+        assert thresholds["action_cooldown"] == DEFAULT_ACTION_COOLDOWN
+    finally:
+        processor.cleanup()
+
+
+def test_load_profile_applies_tuned_thresholds(tmp_path):
+    processor = make_processor()
+    try:
+        # Shape of the tuner's --output file
+        tuned = dict(processor.get_thresholds(), noise_floor=0.02, walk_threshold=0.06,
+                     action_cooldown=0.2, sustained_threshold=0.0, whistle_range=[1, 2])
+        path = tmp_path / "venue.json"
+        path.write_text(json.dumps({"thresholds": tuned, "accuracy": 1.0}))
+
+        processor.load_profile(path)
+        thresholds = processor.get_thresholds()
+        assert (thresholds["noise_floor"], thresholds["walk_threshold"]) == (0.02, 0.06)
+        assert (thresholds["action_cooldown"], thresholds["sustained_threshold"]) == (0.2, 0.0)
+        assert thresholds["whistle_range"] == (1000, 3000)
+    finally:
+        processor.cleanup()